@@ -0,0 +1,47 @@
+"""baseline
+
+Revision ID: 3a1f6c2d9b07
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = "3a1f6c2d9b07"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases that predate migrations already have these tables.
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if "feedback" not in tables:
+        op.create_table(
+            "feedback",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("email", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("feedback", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column("score", sa.Integer(), nullable=True),
+            sa.Column("date_created", sa.DateTime(), nullable=False),
+            sa.Column("page", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    if "waitlist" not in tables:
+        op.create_table(
+            "waitlist",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("email", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column("date_created", sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("waitlist")
+    op.drop_table("feedback")
@@ -0,0 +1,48 @@
+"""feedback delivery
+
+Revision ID: 8c4e2b7a5d13
+Revises: 3a1f6c2d9b07
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "8c4e2b7a5d13"
+down_revision: Union[str, None] = "3a1f6c2d9b07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Skip the columns of tables created from the current models.
+    columns = {
+        column["name"] for column in sa.inspect(op.get_bind()).get_columns("feedback")
+    }
+    with op.batch_alter_table("feedback") as batch_op:
+        if "delivered_at" not in columns:
+            batch_op.add_column(sa.Column("delivered_at", sa.DateTime(), nullable=True))
+        if "attempts" not in columns:
+            batch_op.add_column(
+                sa.Column("attempts", sa.Integer(), nullable=False, server_default="0")
+            )
+        if "failed_at" not in columns:
+            batch_op.add_column(sa.Column("failed_at", sa.DateTime(), nullable=True))
+        if "claimed_at" not in columns:
+            batch_op.add_column(sa.Column("claimed_at", sa.DateTime(), nullable=True))
+
+    if "delivered_at" not in columns:
+        # Nothing recorded deliveries before this revision, so mark the existing
+        # feedback as delivered to keep the worker from posting all of it again.
+        op.execute("UPDATE feedback SET delivered_at = date_created")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("feedback") as batch_op:
+        batch_op.drop_column("claimed_at")
+        batch_op.drop_column("failed_at")
+        batch_op.drop_column("attempts")
+        batch_op.drop_column("delivered_at")
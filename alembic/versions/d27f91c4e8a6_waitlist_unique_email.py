@@ -0,0 +1,37 @@
+"""waitlist unique email
+
+Revision ID: d27f91c4e8a6
+Revises: 8c4e2b7a5d13
+Create Date: 2026-10-18 09:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d27f91c4e8a6"
+down_revision: Union[str, None] = "8c4e2b7a5d13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Skip tables created from the current models, which have the index already.
+    indexes = {
+        index["name"] for index in sa.inspect(op.get_bind()).get_indexes("waitlist")
+    }
+    if "ix_waitlist_email" in indexes:
+        return
+
+    # Keep the first signup of each address.
+    op.execute(
+        "DELETE FROM waitlist WHERE id NOT IN "
+        "(SELECT MIN(id) FROM waitlist GROUP BY email)"
+    )
+    op.create_index("ix_waitlist_email", "waitlist", ["email"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_waitlist_email", table_name="waitlist")
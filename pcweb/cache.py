@@ -0,0 +1,108 @@
+"""A small on-disk cache for expensive build steps."""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Any
+
+# The directory to store cache entries in. Set to an empty string to disable.
+CACHE_DIR = os.environ.get(
+    "REFLEX_WEB_CACHE_DIR", os.path.join(".web", "reflex-web-cache")
+)
+
+
+def hash_key(*parts: Any) -> str:
+    """Create a cache key from a sequence of parts.
+
+    Args:
+        *parts: The values the cached data depends on.
+
+    Returns:
+        A hex digest identifying the parts.
+    """
+    h = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = str(part).encode("utf-8")
+        h.update(part)
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def get_path(namespace: str, name: str) -> str:
+    """Get the path of a cache entry.
+
+    Args:
+        namespace: The namespace of the entry (e.g. "flexdown").
+        name: The name of the entry within the namespace.
+
+    Returns:
+        The path of the entry.
+    """
+    return os.path.join(CACHE_DIR, namespace, f"{hash_key(name)}.pickle")
+
+
+def load(namespace: str, name: str, key: str) -> Any | None:
+    """Load a cache entry.
+
+    Args:
+        namespace: The namespace of the entry.
+        name: The name of the entry.
+        key: The key the entry must have been stored with.
+
+    Returns:
+        The cached value, or None if it is missing or stale.
+    """
+    if not CACHE_DIR:
+        return None
+    try:
+        with open(get_path(namespace, name), "rb") as f:
+            stored_key, value = pickle.load(f)
+    except Exception:
+        # Missing or corrupt entries are treated as cache misses.
+        return None
+    if stored_key != key:
+        return None
+    return value
+
+
+def write_atomic(path: str, data: bytes | str):
+    """Write a file, replacing it in one step so readers never see a partial file.
+
+    Args:
+        path: The path of the file.
+        data: The contents of the file; text is written as UTF-8.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def store(namespace: str, name: str, key: str, value: Any):
+    """Store a cache entry, replacing any previous entry with the same name.
+
+    Args:
+        namespace: The namespace of the entry.
+        name: The name of the entry.
+        key: The key to store the entry with.
+        value: The value to store.
+    """
+    if not CACHE_DIR:
+        return
+    path = get_path(namespace, name)
+    try:
+        write_atomic(path, pickle.dumps((key, value)))
+    except Exception as e:
+        # The cache is an optimization, so never fail the build over it.
+        print(f"Failed to write cache entry {path}: {e}")
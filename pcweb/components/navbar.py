@@ -1,14 +1,17 @@
 """UI and logic for the navbar component."""
-import os
-from datetime import datetime
-from typing import Any, Optional, Set
-
-import requests
-from sqlmodel import Field
+import asyncio
+from typing import Any, Set
 
 import reflex as rx
 from pcweb import constants, styles
 from pcweb.components.logo import navbar_logo
+from pcweb.components.static_search import (
+    static_search_input,
+    static_search_results,
+)
+from pcweb.feedback import Feedback, feedback_queue
+from pcweb.search import search_docs, suggest
+from pcweb.search.static import use_static_search
 from reflex.vars import ImportVar, Var
 
 
@@ -148,12 +151,11 @@ const inkeepEmbeddedChatProps = {
 inkeep = Search.create
 
 
-class Feedback(rx.Model, table=True):
-    email: Optional[str]
-    feedback: str
-    score: Optional[int]
-    date_created: datetime = Field(default_factory=datetime.utcnow, nullable=False)
-    page: str
+# How long to wait for more keystrokes before searching.
+SEARCH_DEBOUNCE_SECONDS = 0.2
+
+# The running search task of each client, so superseded searches can be cancelled.
+_search_tasks: dict[str, asyncio.Task] = {}
 
 
 class NavbarState(rx.State):
@@ -166,6 +168,11 @@ class NavbarState(rx.State):
 
     search_input: str = ""
 
+    search_results: list[dict[str, dict[str, str]]] = []
+
+    # Names matching the input, shown while the full search runs.
+    suggestions: list[dict[str, str]] = []
+
     enter: bool = False
 
     banner: bool = True
@@ -183,7 +190,7 @@ class NavbarState(rx.State):
 
     current_category = "All"
 
-    def handle_submit(self, form_data: dict):
+    async def handle_submit(self, form_data: dict):
         feedback = form_data["feedback"]
 
         # Check if the email is valid.
@@ -195,21 +202,15 @@ class NavbarState(rx.State):
                 "Please enter your feedback. Between 10 and 500 characters."
             )
 
-        current_page_route = self.get_current_page()
-
-        discord_message = f"""
-Contact: {self.email}
-Page: {current_page_route}
-Score: {"?" if  self.page_score==0 else "👍" if self.page_score > 1 else "👎"}
-Feedback: {feedback}
-"""
-
-        DISCORD_WEBHOOK_URL = os.environ.get("DISCORD_WEBHOOK_URL")
-        payload = {"content": discord_message}
-        try:
-            requests.post(DISCORD_WEBHOOK_URL, json=payload)
-        except:
-            pass
+        # Store the feedback; it is posted to Discord in the background.
+        await feedback_queue.submit(
+            Feedback(
+                email=self.email,
+                feedback=feedback,
+                score=self.page_score,
+                page=self.get_current_page(),
+            )
+        )
 
         self.show_form = False
         self.form_submitted = True
@@ -244,36 +245,40 @@ Feedback: {feedback}
 
     def update_category(self, tag):
         self.current_category = tag
+        return NavbarState.search
 
-    @rx.cached_var
-    def search_results(self) -> list[dict[str, dict[str, str]]]:
-        """Get the search results."""
-        from pcweb.tsclient import client
-
-        if client is None or self.search_input == "":
-            return []
-
-        if self.current_category == "All":
-            search_parameters = {
-                "q": self.search_input,
-                "query_by": "heading, description",
-                "query_by_weights": "2,1",
-                "sort_by": "_text_match:desc",
-            }
-        else:
-            search_parameters = {
-                "q": self.search_input,
-                "query_by": "heading, description",
-                "query_by_weights": "2,1",
-                "sort_by": "_text_match:desc",
-                "filter_by": f"category: {self.current_category}",
-            }
-        typesense_collection_name = os.getenv(
-            "TYPESENSE_COLLECTION_NAME", "search-auto"
-        )
-        return client.collections[typesense_collection_name].documents.search(
-            search_parameters
-        )["hits"]
+    def set_search_input(self, search_input: str):
+        self.search_input = search_input
+        self.suggestions = suggest(search_input)
+        return NavbarState.search
+
+    @rx.background
+    async def search(self):
+        """Search the docs for the current input.
+
+        Searches are debounced, and a new search cancels the client's
+        previous one, so fast typing only sends the final query.
+        """
+        token = self.router.session.client_token
+        previous = _search_tasks.get(token)
+        if previous is not None and not previous.done():
+            previous.cancel()
+        task = asyncio.current_task()
+        _search_tasks[token] = task
+
+        try:
+            await asyncio.sleep(SEARCH_DEBOUNCE_SECONDS)
+            async with self:
+                query, category = self.search_input, self.current_category
+            results = await search_docs(query, category)
+            async with self:
+                self.search_results = results
+        except asyncio.CancelledError:
+            # A newer search replaced this one.
+            pass
+        finally:
+            if _search_tasks.get(token) is task:
+                del _search_tasks[token]
 
 
 def search_bar():
@@ -366,6 +371,17 @@ def format_search_results(result):
     )
 
 
+def format_suggestion(suggestion):
+    return rx.wrap_item(
+        rx.link(
+            rx.code(suggestion["name"]),
+            on_click=NavbarState.close_search,
+            href=suggestion["href"],
+            style={"text_decoration": "none"},
+        )
+    )
+
+
 def ai_button():
     return rx.center(
         rx.icon(
@@ -393,7 +409,47 @@ def search_bar_categories(categories):
     )
 
 
+def search_input(static: bool):
+    if static:
+        return static_search_input(placeholder="Search the docs...")
+    return rx.input(
+        placeholder="Search the docs...",
+        on_change=NavbarState.set_search_input,
+        focus_border_color="transparent",
+        border_color="transparent",
+        font_weight=400,
+        _placeholder={"color": "#342E5C"},
+        _hover={"border_color": "transparent"},
+    )
+
+
+def search_results(static: bool):
+    if static:
+        return static_search_results(
+            category=NavbarState.current_category,
+            on_select=NavbarState.close_search,
+        )
+    return rx.vstack(
+        rx.wrap(
+            rx.foreach(NavbarState.suggestions, format_suggestion),
+            spacing="0.5em",
+        ),
+        rx.foreach(
+            NavbarState.search_results,
+            format_search_results,
+        ),
+        spacing="1em",
+        width="100%",
+        max_height="30em",
+        align_items="start",
+        overflow_y="auto",
+        padding_top="0em",
+    )
+
+
 def search_modal():
+    # Search in the browser only when it has been explicitly enabled.
+    static = use_static_search()
     return rx.modal(
         rx.modal_overlay(
             rx.modal_content(
@@ -408,15 +464,7 @@ def search_modal():
                             style=styles.NAV_SEARCH_STYLE,
                             height="1em",
                         ),
-                        rx.input(
-                            placeholder="Search the docs...",
-                            on_change=NavbarState.set_search_input,
-                            focus_border_color="transparent",
-                            border_color="transparent",
-                            font_weight=400,
-                            _placeholder={"color": "#342E5C"},
-                            _hover={"border_color": "transparent"},
-                        ),
+                        search_input(static),
                         ai_button(),
                         border_bottom="1px solid #F4F3F6",
                     ),
@@ -425,18 +473,7 @@ def search_modal():
                     rx.vstack(
                         rx.cond(
                             NavbarState.ai_chat,
-                            rx.vstack(
-                                rx.foreach(
-                                    NavbarState.search_results,
-                                    format_search_results,
-                                ),
-                                spacing="1em",
-                                width="100%",
-                                max_height="30em",
-                                align_items="start",
-                                overflow_y="auto",
-                                padding_top="0em",
-                            ),
+                            search_results(static),
                             inkeep(
                                 width="100%",
                             ),
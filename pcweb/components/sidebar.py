@@ -510,20 +510,30 @@ def sidebar_item_comp(
     )
 
 
-def calculate_index(sidebar_items, url):
-    if not isinstance(sidebar_items, list):
-        sidebar_items = [sidebar_items]
+def build_index_table(sidebar_items) -> dict[str, list[int]]:
+    """Map every link in a sidebar section to its accordion index.
 
-    sub = 0
-    for i, item in enumerate(sidebar_items):
-        if len(item.children) == 0:
-            sub += 1
-        if item.link == url:
-            return [i - sub]
-        index = calculate_index(item.children, url)
-        if index is not None:
-            return [i - sub] + index
-    return None
+    Args:
+        sidebar_items: The items of the sidebar section.
+
+    Returns:
+        A mapping from link to the accordion index path that opens it.
+    """
+    table = {}
+
+    def walk(items, prefix):
+        sub = 0
+        for i, item in enumerate(items):
+            if len(item.children) == 0:
+                sub += 1
+            index = prefix + [i - sub]
+
+            # Keep the first match, as a depth-first search would find it.
+            table.setdefault(item.link, index)
+            walk(item.children, index)
+
+    walk(sidebar_items, [])
+    return table
 
 
 learn = get_sidebar_items_learn()
@@ -533,29 +543,88 @@ backend = get_sidebar_items_backend()
 hosting = get_sidebar_items_hosting()
 other_libs = get_sidebar_items_other_libraries()
 
+# The sidebar sections, by name.
+sidebar_sections = {
+    "learn": learn,
+    "reference": reference,
+    "frontend": frontend,
+    "backend": backend,
+    "hosting": hosting,
+    "other_libs": other_libs,
+}
 
-def get_prev_next(url):
-    """Get the previous and next links in the sidebar."""
-    sidebar_items = learn + frontend + backend + hosting + reference
-    # Flatten the list of sidebar items
+# Mapping from url to the accordion index of each section containing it.
+sidebar_index_table: dict[str, dict[str, list[int]]] = {}
+for section_name, section_items in sidebar_sections.items():
+    for link, index in build_index_table(section_items).items():
+        sidebar_index_table.setdefault(link, {})[section_name] = index
+
+
+def flatten_items(sidebar_items) -> list[SidebarItem]:
+    """Get the leaf items of the sidebar in display order.
+
+    Args:
+        sidebar_items: The items to flatten.
+
+    Returns:
+        The leaf items.
+    """
     flat_items = []
+    for item in sidebar_items:
+        if len(item.children) == 0:
+            flat_items.append(item)
+        flat_items.extend(flatten_items(item.children))
+    return flat_items
 
-    def append_to_items(items):
-        for item in items:
-            if len(item.children) == 0:
-                flat_items.append(item)
-            append_to_items(item.children)
 
-    append_to_items(sidebar_items)
+def build_prev_next_table(
+    sidebar_items,
+) -> dict[str, tuple[SidebarItem | None, SidebarItem | None]]:
+    """Map every link in the sidebar to the previous and next links.
+
+    Args:
+        sidebar_items: The items of the sidebar.
+
+    Returns:
+        A mapping from link to the (previous, next) items.
+    """
+    flat_items = flatten_items(sidebar_items)
+    table = {}
     for i, item in enumerate(flat_items):
-        if item.link == url:
-            if i == 0:
-                return None, flat_items[i + 1]
-            elif i == len(flat_items) - 1:
-                return flat_items[i - 1], None
-            else:
-                return flat_items[i - 1], flat_items[i + 1]
-    return None, None
+        prev = flat_items[i - 1] if i > 0 else None
+        next = flat_items[i + 1] if i < len(flat_items) - 1 else None
+
+        # Keep the first occurrence of links that appear more than once.
+        table.setdefault(item.link, (prev, next))
+    return table
+
+
+# Mapping from url to the previous and next links of the docs.
+prev_next_table = build_prev_next_table(
+    learn + frontend + backend + hosting + reference
+)
+
+
+def get_prev_next(url):
+    """Get the previous and next links in the sidebar."""
+    return prev_next_table.get(url, (None, None))
+
+
+def get_unregistered_links(paths: set[str]) -> list[SidebarItem]:
+    """Find the sidebar links that don't lead to a page.
+
+    Args:
+        paths: The paths of all registered pages.
+
+    Returns:
+        The sidebar items whose link isn't one of the paths.
+    """
+    return [
+        item
+        for section_items in sidebar_sections.values()
+        for item in flatten_items(section_items)
+        if item.link not in paths
+    ]
 
 
 signle_item = {
@@ -730,22 +799,17 @@ def sidebar_comp(
 
 def sidebar(url=None) -> rx.Component:
     """Render the sidebar."""
-    learn_index = calculate_index(learn, url)
-    reference_index = calculate_index(reference, url)
-    frontend_index = calculate_index(frontend, url)
-    backend_index = calculate_index(backend, url)
-    hosting_index = calculate_index(hosting, url)
-    other_libs_index = calculate_index(other_libs, url)
+    indices = sidebar_index_table.get(url, {})
 
     return rx.box(
         sidebar_comp(
             url=url,
-            learn_index=learn_index,
-            reference_index=reference_index,
-            frontend_index=frontend_index,
-            backend_index=backend_index,
-            hosting_index=hosting_index,
-            other_libs_index=other_libs_index,
+            learn_index=indices.get("learn"),
+            reference_index=indices.get("reference"),
+            frontend_index=indices.get("frontend"),
+            backend_index=indices.get("backend"),
+            hosting_index=indices.get("hosting"),
+            other_libs_index=indices.get("other_libs"),
         ),
         width="100%",
     )
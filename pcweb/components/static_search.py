@@ -0,0 +1,278 @@
+"""Search the docs in the browser, using the static search index."""
+import json
+from typing import Any
+
+import reflex as rx
+from pcweb import styles
+from pcweb.search import engine
+from pcweb.search.static import STATIC_INDEX_URL
+from reflex.utils import imports
+from reflex.vars import ImportVar, Var
+
+# The settings shared with the browser, so it ranks like the local index.
+_SETTINGS = {
+    "maxPrefixExpansions": engine.MAX_PREFIX_EXPANSIONS,
+    "prefixMatchWeight": engine.PREFIX_MATCH_WEIGHT,
+    "colors": {
+        "heading": styles.c["indigo"][700],
+        "description": styles.c["indigo"][500],
+        "badge": styles.c["violet"][500],
+        "badgeBackground": styles.c["violet"][50],
+        "background": "#f4f3f4",
+        "hover": "#F5EFFE",
+    },
+}
+
+# The input and the results live in different parts of the search modal, so
+# they share the query through a small store instead of React props.
+STATIC_SEARCH_CODE = (
+    f"const staticSearchSettings = {json.dumps(_SETTINGS)};"
+    + """
+const staticSearchTokenPattern = /[\\p{L}\\p{N}_]+/gu;
+const staticSearchListeners = new Set();
+let staticSearchQuery = "";
+let staticSearchIndex = null;
+
+function setStaticSearchQuery(query) {
+  staticSearchQuery = query;
+  staticSearchListeners.forEach((listener) => listener(query));
+}
+
+function useStaticSearchQuery() {
+  const [query, setQuery] = useState(staticSearchQuery);
+  useEffect(() => {
+    staticSearchListeners.add(setQuery);
+    return () => staticSearchListeners.delete(setQuery);
+  }, []);
+  return query;
+}
+
+function loadStaticSearchIndex(url) {
+  if (staticSearchIndex === null) {
+    staticSearchIndex = fetch(url)
+      .then((response) => response.arrayBuffer())
+      .then(async (buffer) => {
+        const bytes = new Uint8Array(buffer);
+        // The host may have already decoded the gzip content encoding.
+        if (bytes[0] === 0x1f && bytes[1] === 0x8b) {
+          const stream = new Blob([bytes])
+            .stream()
+            .pipeThrough(new DecompressionStream("gzip"));
+          return JSON.parse(await new Response(stream).text());
+        }
+        return JSON.parse(new TextDecoder().decode(bytes));
+      })
+      .catch((error) => {
+        staticSearchIndex = null;
+        throw error;
+      });
+  }
+  return staticSearchIndex;
+}
+
+function searchStaticIndex(index, query, category, limit) {
+  const tokens = query.toLowerCase().match(staticSearchTokenPattern) || [];
+  let scores = null;
+  for (const token of tokens) {
+    // Find the first term that could start with the token.
+    let lo = 0;
+    let hi = index.terms.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (index.terms[mid] < token) {
+        lo = mid + 1;
+      } else {
+        hi = mid;
+      }
+    }
+
+    const tokenScores = new Map();
+    for (
+      let i = lo;
+      i < index.terms.length &&
+      i - lo < staticSearchSettings.maxPrefixExpansions &&
+      index.terms[i].startsWith(token);
+      i++
+    ) {
+      const postings = index.postings[i];
+      const count = postings.length / 2;
+      const idf = Math.log(1 + (index.docs.length - count + 0.5) / (count + 0.5));
+      const weight =
+        idf * (index.terms[i] === token ? 1 : staticSearchSettings.prefixMatchWeight);
+      for (let j = 0; j < postings.length; j += 2) {
+        const score = weight * postings[j + 1];
+        if (score > (tokenScores.get(postings[j]) || 0)) {
+          tokenScores.set(postings[j], score);
+        }
+      }
+    }
+
+    // Every token must match.
+    if (scores === null) {
+      scores = tokenScores;
+    } else {
+      const merged = new Map();
+      for (const [doc, score] of scores) {
+        if (tokenScores.has(doc)) {
+          merged.set(doc, score + tokenScores.get(doc));
+        }
+      }
+      scores = merged;
+    }
+    if (scores.size === 0) {
+      return [];
+    }
+  }
+  if (scores === null) {
+    return [];
+  }
+
+  return [...scores]
+    .filter(([doc]) => category === "All" || index.docs[doc][3] === category)
+    .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+    .slice(0, limit)
+    .map(([doc]) => index.docs[doc]);
+}
+
+function StaticSearchInput({ placeholder, ...props }) {
+  return (
+    <input
+      placeholder={placeholder}
+      defaultValue={staticSearchQuery}
+      onChange={(event) => setStaticSearchQuery(event.target.value)}
+      style={{
+        width: "100%",
+        border: "none",
+        outline: "none",
+        background: "transparent",
+        fontWeight: 400,
+        padding: "0.5em",
+      }}
+      {...props}
+    />
+  );
+}
+
+function StaticSearchResults({ indexUrl, category = "All", limit = 10, onSelect }) {
+  const query = useStaticSearchQuery();
+  const [index, setIndex] = useState(null);
+  useEffect(() => {
+    loadStaticSearchIndex(indexUrl)
+      .then(setIndex)
+      .catch((error) => console.error("Failed to load the search index.", error));
+  }, [indexUrl]);
+
+  const colors = staticSearchSettings.colors;
+  const results = index === null ? [] : searchStaticIndex(index, query, category, limit);
+  return (
+    <div
+      style={{
+        display: "flex",
+        flexDirection: "column",
+        gap: "1em",
+        width: "100%",
+        maxHeight: "30em",
+        overflowY: "auto",
+      }}
+    >
+      {results.map(([heading, description, href, resultCategory]) => (
+        <a
+          key={href + heading}
+          href={href}
+          onClick={onSelect}
+          style={{ textDecoration: "none", width: "100%" }}
+        >
+          <div
+            style={{
+              background: colors.background,
+              borderRadius: "8px",
+              padding: "0.25em 0.5em",
+            }}
+            onMouseEnter={(event) => (event.currentTarget.style.background = colors.hover)}
+            onMouseLeave={(event) => (event.currentTarget.style.background = colors.background)}
+          >
+            <div style={{ display: "flex", justifyContent: "space-between" }}>
+              <span style={{ fontWeight: 600, color: colors.heading }}>{heading}</span>
+              <span
+                style={{
+                  color: colors.badge,
+                  background: colors.badgeBackground,
+                  borderRadius: "8px",
+                  padding: "0 0.5em",
+                  fontSize: "0.75em",
+                  fontWeight: 700,
+                  textTransform: "uppercase",
+                }}
+              >
+                {resultCategory}
+              </span>
+            </div>
+            <div
+              style={{
+                color: colors.description,
+                whiteSpace: "nowrap",
+                overflow: "hidden",
+                textOverflow: "ellipsis",
+              }}
+            >
+              {description}
+            </div>
+          </div>
+        </a>
+      ))}
+    </div>
+  );
+}
+"""
+)
+
+
+class StaticSearchComponent(rx.Component):
+    """A component that is defined by the static search code."""
+
+    def _get_imports(self):
+        return imports.merge_imports(
+            super()._get_imports(),
+            {"react": {ImportVar(tag="useEffect"), ImportVar(tag="useState")}},
+        )
+
+    def _get_custom_code(self) -> str:
+        return STATIC_SEARCH_CODE
+
+
+class StaticSearchInput(StaticSearchComponent):
+    """The search input."""
+
+    tag = "StaticSearchInput"
+
+    placeholder: Var[str]
+
+
+class StaticSearchResults(StaticSearchComponent):
+    """The results of searching the static index for the input's query."""
+
+    tag = "StaticSearchResults"
+
+    # The URL of the static index.
+    index_url: Var[str] = STATIC_INDEX_URL
+
+    # The category to search in, or "All".
+    category: Var[str]
+
+    # The maximum number of results.
+    limit: Var[int]
+
+    def get_event_triggers(self) -> dict[str, Any]:
+        """Get the event triggers that pass the component's value to the handler.
+
+        Returns:
+            A dict mapping the event trigger to the var that is passed to the handler.
+        """
+        return {
+            **super().get_event_triggers(),
+            "on_select": lambda: [],
+        }
+
+
+static_search_input = StaticSearchInput.create
+static_search_results = StaticSearchResults.create
@@ -1,4 +1,11 @@
 # pcweb constants.
+from importlib import metadata
+
+# The installed reflex version, which generated docs data is tied to.
+try:
+    REFLEX_VERSION = metadata.version("reflex")
+except metadata.PackageNotFoundError:
+    REFLEX_VERSION = "unknown"
 
 # pcweb urls.
 REFLEX_URL = "https://reflex.dev"
@@ -0,0 +1,316 @@
+"""Store user feedback and deliver it to Discord in the background."""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+import httpx
+from sqlalchemy import or_, update
+from sqlmodel import Field
+
+import reflex as rx
+
+# The Discord webhook to post feedback to. Point it at a local server to test.
+DISCORD_WEBHOOK_URL = os.environ.get("DISCORD_WEBHOOK_URL")
+
+# The request timeout for posting to Discord, in seconds.
+FEEDBACK_TIMEOUT_SECONDS = 5
+
+# How many times to try posting a message before giving up until the next scan.
+FEEDBACK_MAX_ATTEMPTS = 5
+
+# How many times a worker may claim feedback for delivery before giving up on it.
+FEEDBACK_MAX_DELIVERIES = 5
+
+# A claim older than this is assumed to belong to a worker that died, in seconds.
+FEEDBACK_CLAIM_TIMEOUT_SECONDS = 600
+
+# How often to look for feedback that still has to be delivered, in seconds.
+FEEDBACK_SCAN_INTERVAL_SECONDS = 300
+
+# How long to wait before retrying a failed post, doubled after each attempt.
+FEEDBACK_BACKOFF_SECONDS = 1.0
+
+# How long to wait for more feedback to post along with the first, in seconds.
+FEEDBACK_BATCH_WAIT_SECONDS = 2.0
+
+# The maximum number of feedback entries to post in one batch.
+FEEDBACK_BATCH_SIZE = 10
+
+# Discord rejects messages longer than this.
+DISCORD_MAX_MESSAGE_LENGTH = 2000
+
+
+class Feedback(rx.Model, table=True):
+    email: Optional[str]
+    feedback: str
+    score: Optional[int]
+    date_created: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    page: str
+    # When the feedback was posted to Discord, or None if it hasn't been yet.
+    delivered_at: Optional[datetime] = None
+    # How many times a worker has claimed the feedback for delivery.
+    attempts: int = 0
+    # When delivery was given up on, or None if it hasn't been.
+    failed_at: Optional[datetime] = None
+    # When a worker claimed the feedback for delivery, or None if none has.
+    claimed_at: Optional[datetime] = None
+
+
+def format_feedback(feedback: Feedback) -> str:
+    """Format feedback as a Discord message.
+
+    Args:
+        feedback: The feedback to format.
+
+    Returns:
+        The message.
+    """
+    score = "?" if not feedback.score else "👍" if feedback.score > 1 else "👎"
+    return f"""
+Contact: {feedback.email}
+Page: {feedback.page}
+Score: {score}
+Feedback: {feedback.feedback}
+"""
+
+
+def pack_messages(messages: list[str]) -> list[list[int]]:
+    """Group messages into as few Discord posts as fit.
+
+    Args:
+        messages: The messages to post.
+
+    Returns:
+        The positions of the messages in each post.
+    """
+    posts = []
+    length = 0
+    for i, message in enumerate(messages):
+        if posts and length + len(message) <= DISCORD_MAX_MESSAGE_LENGTH:
+            posts[-1].append(i)
+            length += len(message)
+        else:
+            posts.append([i])
+            length = len(message)
+    return posts
+
+
+class FeedbackQueue:
+    """Stores feedback and posts it to Discord from a background worker.
+
+    Feedback is saved before it is queued, so entries that weren't delivered
+    (because of errors or a restart) are posted when the worker next scans the
+    database for them, which it does when it starts and then periodically.
+    Every backend process has its own worker, so each entry is claimed in the
+    database before it is posted, and only the worker that claims it posts it.
+    """
+
+    def __init__(self, webhook_url: str | None):
+        """Initialize the queue.
+
+        Args:
+            webhook_url: The Discord webhook to post to, or None to only store feedback.
+        """
+        self.webhook_url = webhook_url
+        self._queue: asyncio.Queue[int] | None = None
+        self._worker: asyncio.Task | None = None
+        self._client: httpx.AsyncClient | None = None
+
+    async def submit(self, feedback: Feedback):
+        """Store feedback and queue it for delivery.
+
+        Args:
+            feedback: The feedback to submit.
+        """
+        feedback_id = await asyncio.to_thread(self._save, feedback)
+        if self.webhook_url is None:
+            return
+        self._ensure_worker()
+        self._queue.put_nowait(feedback_id)
+
+    def _save(self, feedback: Feedback) -> int:
+        with rx.session() as session:
+            session.add(feedback)
+            session.commit()
+            session.refresh(feedback)
+            return feedback.id
+
+    def _ensure_worker(self):
+        # Start the worker on the event loop of the first submission.
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self):
+        """Post queued feedback in batches, forever."""
+        loop = asyncio.get_running_loop()
+        next_scan = loop.time()
+        while True:
+            if loop.time() >= next_scan:
+                # Pick up the feedback whose post failed, or whose worker died.
+                next_scan = loop.time() + FEEDBACK_SCAN_INTERVAL_SECONDS
+                try:
+                    for feedback_id in await asyncio.to_thread(self._load_undelivered):
+                        self._queue.put_nowait(feedback_id)
+                except Exception as e:
+                    print(f"Failed to load undelivered feedback: {e}")
+
+            try:
+                batch = [
+                    await asyncio.wait_for(
+                        self._queue.get(), max(next_scan - loop.time(), 0)
+                    )
+                ]
+            except asyncio.TimeoutError:
+                continue
+            deadline = loop.time() + FEEDBACK_BATCH_WAIT_SECONDS
+            while len(batch) < FEEDBACK_BATCH_SIZE:
+                try:
+                    batch.append(
+                        await asyncio.wait_for(
+                            self._queue.get(), max(deadline - loop.time(), 0)
+                        )
+                    )
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._deliver(sorted(set(batch)))
+            except Exception as e:
+                # Keep the worker alive; the batch is picked up again by a later
+                # scan, once its claim expires.
+                print(f"Failed to deliver feedback: {e}")
+
+    def _load_undelivered(self) -> list[int]:
+        with rx.session() as session:
+            rows = (
+                session.query(Feedback)
+                .filter(Feedback.delivered_at == None, Feedback.failed_at == None)
+                .all()
+            )
+            return [row.id for row in rows]
+
+    def _claim(self, feedback_ids: list[int]) -> list[Feedback]:
+        """Claim feedback for delivery.
+
+        Each entry is claimed with a conditional update, so when several
+        workers try to claim it at once only one of them succeeds.
+
+        Args:
+            feedback_ids: The ids of the feedback to claim.
+
+        Returns:
+            The feedback that was claimed.
+        """
+        now = datetime.utcnow()
+        expired = now - timedelta(seconds=FEEDBACK_CLAIM_TIMEOUT_SECONDS)
+        claimed = []
+        with rx.session() as session:
+            for feedback_id in feedback_ids:
+                result = session.execute(
+                    update(Feedback)
+                    .where(
+                        Feedback.id == feedback_id,
+                        Feedback.delivered_at == None,
+                        Feedback.failed_at == None,
+                        or_(Feedback.claimed_at == None, Feedback.claimed_at < expired),
+                    )
+                    .values(claimed_at=now, attempts=Feedback.attempts + 1)
+                )
+                if result.rowcount == 1:
+                    claimed.append(feedback_id)
+            session.commit()
+            if not claimed:
+                return []
+            rows = session.query(Feedback).filter(Feedback.id.in_(claimed)).all()
+            return sorted(rows, key=lambda row: row.id)
+
+    def _release(self, feedback_ids: list[int], status: str):
+        """Record the outcome of posting feedback and release its claim.
+
+        Args:
+            feedback_ids: The ids of the feedback that was posted.
+            status: The result of the post (delivered, rejected or failed).
+        """
+        now = datetime.utcnow()
+        with rx.session() as session:
+            rows = session.query(Feedback).filter(Feedback.id.in_(feedback_ids)).all()
+            for row in rows:
+                row.claimed_at = None
+                if status == "delivered":
+                    row.delivered_at = now
+                elif status == "rejected" or row.attempts >= FEEDBACK_MAX_DELIVERIES:
+                    # Stop posting feedback Discord won't take, or keeps failing.
+                    row.failed_at = now
+                session.add(row)
+            session.commit()
+
+    async def _deliver(self, feedback_ids: list[int]):
+        """Post a batch of feedback, combining entries into as few messages as fit.
+
+        Args:
+            feedback_ids: The ids of the feedback to post.
+        """
+        rows = await asyncio.to_thread(self._claim, feedback_ids)
+        messages = [format_feedback(row) for row in rows]
+        for post in pack_messages(messages):
+            content = "".join(messages[i] for i in post)[:DISCORD_MAX_MESSAGE_LENGTH]
+            status = await self._post(content)
+            await asyncio.to_thread(self._release, [rows[i].id for i in post], status)
+
+    async def _post(self, content: str) -> str:
+        """Post a message to the webhook, retrying failures and rate limits.
+
+        Args:
+            content: The message to post.
+
+        Returns:
+            "delivered" if the message was posted, "rejected" if Discord refused
+            it, or "failed" if it couldn't be posted for now.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=FEEDBACK_TIMEOUT_SECONDS)
+
+        for attempt in range(FEEDBACK_MAX_ATTEMPTS):
+            delay = FEEDBACK_BACKOFF_SECONDS * 2**attempt
+            try:
+                response = await self._client.post(
+                    self.webhook_url, json={"content": content}
+                )
+            except httpx.HTTPError as e:
+                print(f"Failed to post feedback (attempt {attempt + 1}): {e}")
+            else:
+                if response.is_success:
+                    return "delivered"
+                if response.status_code == 429:
+                    # Wait as long as Discord asks before trying again.
+                    delay = get_retry_after(response, delay)
+                elif response.status_code < 500:
+                    print(f"Discord rejected feedback: {response.status_code}")
+                    return "rejected"
+            await asyncio.sleep(delay)
+        return "failed"
+
+
+def get_retry_after(response: httpx.Response, default: float) -> float:
+    """Get how long a rate-limited response asks to wait.
+
+    Args:
+        response: The rate-limited response.
+        default: The delay to use if the response doesn't say.
+
+    Returns:
+        The delay, in seconds.
+    """
+    try:
+        return float(response.json()["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        pass
+    try:
+        return float(response.headers["Retry-After"])
+    except (ValueError, KeyError):
+        return default
+
+
+feedback_queue = FeedbackQueue(DISCORD_WEBHOOK_URL)
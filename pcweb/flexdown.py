@@ -1,7 +1,18 @@
+import ast
+import contextlib
+import hashlib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
+
 import flexdown
+from flexdown.blocks import ExecBlock, MarkdownBlock
+from flexdown.constants import TEMPLATE_REGEX
+from flexdown.flexdown import DEFAULT_BLOCKS
 
 import reflex as rx
-from pcweb import styles
+from pcweb import cache, styles
 from pcweb.templates.docpage import (
     code_block_markdown,
     code_comp,
@@ -9,6 +20,7 @@ from pcweb.templates.docpage import (
     docdemobox,
     docgraphing,
     doclink2,
+    format_python,
     h1_comp,
     h2_comp,
     h3_comp,
@@ -191,6 +203,24 @@ class DemoBlock(flexdown.blocks.Block):
 
         return docdemo(code, comp=comp, demobox_props=demobox_props)
 
+    def get_code_snippets(self) -> list[str]:
+        """Get the Python snippets this block displays as code.
+
+        Returns:
+            The snippets, exactly as they are passed to `doccode`.
+        """
+        lines = self.get_lines({})
+        code = "\n".join(lines[1:-1])
+        args = lines[0].removeprefix(self.starting_indicator).split()
+
+        if "box" in args:
+            # Box demos only show the component.
+            return []
+        if "graphing" in args:
+            parts = code.rpartition("def")
+            return [parts[1] + parts[2], parts[0]]
+        return [code]
+
 
 component_map = {
     "h1": lambda text: h1_comp(text=text),
@@ -203,12 +233,353 @@ component_map = {
     "codeblock": code_block_markdown,
 }
 
-xd = flexdown.Flexdown(
+try:
+    FLEXDOWN_VERSION = metadata.version("flexdown")
+except metadata.PackageNotFoundError:
+    FLEXDOWN_VERSION = "unknown"
+
+# Bump this when the format of cached documents changes.
+DOCUMENT_CACHE_VERSION = 1
+
+# In-memory copies of parsed files, keyed by the hash of their contents.
+_parsed_files: dict[str, dict] = {}
+
+# The block boundaries of parsed content, keyed by the hash of the content.
+_block_boundaries: dict[str, list[tuple[str, int, int, bool]]] = {}
+
+
+class CachedFlexdown(flexdown.Flexdown):
+    """A Flexdown instance that caches parsed documents on disk.
+
+    Parsed documents are keyed by the hash of the file contents and the
+    flexdown version, so edited files and upgrades are picked up automatically.
+    It can also extract the text of a document without rendering it.
+    """
+
+    def _get_block_types(self) -> dict[str, type[flexdown.blocks.Block]]:
+        """Get the block types this instance can parse, by name.
+
+        Returns:
+            A mapping from block type name to block type.
+        """
+        return {
+            block_type.__name__: block_type
+            for block_type in self.block_types + DEFAULT_BLOCKS
+        }
+
+    def _find_block_boundaries(
+        self, content: str, filename: str | None = None
+    ) -> list[tuple[str, int, int, bool]]:
+        """Split content into blocks and record where each one starts and ends.
+
+        Args:
+            content: The content of a flexdown document.
+            filename: The file the content is from.
+
+        Returns:
+            A list of (block type, first line, last line, finished) tuples.
+        """
+        boundaries = []
+        for block in super().get_blocks(content, filename):
+            end_line = block.start_line_number + len(block.lines) - 1
+            finished = end_line < len(content.splitlines())
+            if not finished:
+                # The block was closed by `finish`, which added a line.
+                end_line -= 1
+            boundaries.append(
+                (type(block).__name__, block.start_line_number, end_line, finished)
+            )
+        return boundaries
+
+    def parse_file(self, path: str) -> flexdown.Document:
+        """Parse a flexdown file, reusing a cached parse when possible.
+
+        Args:
+            path: The path to the flexdown file.
+
+        Returns:
+            The parsed document.
+        """
+        with open(path, "rb") as f:
+            source = f.read()
+        key = cache.hash_key(
+            source,
+            FLEXDOWN_VERSION,
+            DOCUMENT_CACHE_VERSION,
+            *self._get_block_types(),
+        )
+
+        entry = _parsed_files.get(key)
+        if entry is None:
+            entry = cache.load("flexdown", path, key)
+        if entry is None:
+            document = flexdown.Document.from_source(source.decode("utf-8"))
+            entry = {
+                "metadata": document.metadata,
+                "content": document.content,
+                "blocks": self._find_block_boundaries(document.content, path),
+            }
+            cache.store("flexdown", path, key, entry)
+        _parsed_files[key] = entry
+        _block_boundaries[_hash_content(entry["content"])] = entry["blocks"]
+
+        # Rendering mutates the metadata, so always hand out a fresh copy.
+        return flexdown.Document(
+            metadata=dict(entry["metadata"]), content=entry["content"]
+        )
+
+    def get_blocks(self, source: str, filename: str | None = None):
+        """Parse flexdown content into blocks, reusing cached block boundaries.
+
+        Args:
+            source: The content of the flexdown document.
+            filename: The file the content is from.
+
+        Yields:
+            The blocks of the document.
+        """
+        boundaries = _block_boundaries.get(_hash_content(source))
+        if boundaries is None:
+            yield from super().get_blocks(source, filename)
+            return
+
+        block_types = self._get_block_types()
+        lines = source.splitlines()
+        for name, start, end, finished in boundaries:
+            block = block_types[name](
+                start_line_number=start,
+                component_map=self.component_map,
+                filename=filename,
+            )
+            for line in lines[start : end + 1]:
+                block.append(line)
+            if not finished:
+                block.finish()
+            yield block
+
+    def render_file(self, path: str) -> rx.Component:
+        """Render a flexdown file into a component.
+
+        Args:
+            path: The path to the flexdown file.
+
+        Returns:
+            The rendered component.
+        """
+        return self.render(self.parse_file(path), path)
+
+    def get_text(self, source: str | flexdown.Document, filename=None) -> str:
+        """Extract the markdown text of a document without rendering it.
+
+        Demos and other custom blocks are skipped. Only the statements of
+        `python exec` blocks that define names used in template placeholders
+        are run, and placeholders that can't be evaluated are left as is.
+
+        Args:
+            source: The document or its source code.
+            filename: The file the document is from.
+
+        Returns:
+            The markdown of all markdown blocks, with templates evaluated.
+        """
+        if isinstance(source, str):
+            source = flexdown.Document.from_source(source)
+        env = dict(source.metadata)
+        blocks = list(self.get_blocks(source.content, filename))
+        markdown_blocks = [b for b in blocks if isinstance(b, MarkdownBlock)]
+
+        # Find the names the template placeholders refer to.
+        needed = set()
+        for block in markdown_blocks:
+            for line in block.lines:
+                for expression in re.findall(TEMPLATE_REGEX, line):
+                    try:
+                        needed |= _get_used_names(ast.parse(expression, mode="eval"))
+                    except SyntaxError:
+                        continue
+
+        # Run just the code that defines those names.
+        if needed:
+            statements = []
+            for block in blocks:
+                if isinstance(block, ExecBlock):
+                    try:
+                        statements += ast.parse(block.get_content(env)).body
+                    except SyntaxError:
+                        continue
+            for statement in _select_statements(statements, needed):
+                module = ast.Module(body=[statement], type_ignores=[])
+                try:
+                    exec(compile(module, filename or "<flexdown>", "exec"), env)
+                except Exception:
+                    continue
+
+        return "\n".join(
+            "\n".join(_get_text_lines(block, env)) for block in markdown_blocks
+        )
+
+
+def _hash_content(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _get_used_names(node: ast.AST) -> set[str]:
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+
+
+def _get_bound_names(statement: ast.stmt) -> set[str]:
+    """Get the names a top-level statement defines.
+
+    Args:
+        statement: The statement.
+
+    Returns:
+        The names, including "*" for star imports.
+    """
+    if isinstance(statement, (ast.Import, ast.ImportFrom)):
+        return {(a.asname or a.name).split(".")[0] for a in statement.names}
+    if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return {statement.name}
+    if isinstance(statement, ast.Assign):
+        return set().union(*(_get_used_names(t) for t in statement.targets))
+    if isinstance(statement, (ast.AnnAssign, ast.AugAssign)):
+        return _get_used_names(statement.target)
+    return set()
+
+
+def _select_statements(statements: list[ast.stmt], needed: set[str]) -> list[ast.stmt]:
+    """Select the statements needed to define some names.
+
+    Args:
+        statements: The top-level statements of the code.
+        needed: The names to define.
+
+    Returns:
+        The statements, in order, that define the names or their dependencies.
+    """
+    needed = set(needed)
+    selected = set()
+    changed = True
+    while changed:
+        changed = False
+        for i, statement in enumerate(statements):
+            if i in selected:
+                continue
+            bound = _get_bound_names(statement)
+            if bound & needed or "*" in bound:
+                selected.add(i)
+                needed |= _get_used_names(statement)
+                changed = True
+    return [statements[i] for i in sorted(selected)]
+
+
+def _get_text_lines(block: flexdown.blocks.Block, env: dict) -> list[str]:
+    """Get the lines of a block, evaluating templates where possible.
+
+    Args:
+        block: The block.
+        env: The environment to evaluate templates in.
+
+    Returns:
+        The lines of the block.
+    """
+
+    def evaluate(match: re.Match) -> str:
+        try:
+            return str(eval(match.group(1), env, env))
+        except Exception:
+            return match.group(0)
+
+    start_index = (
+        0 if block.include_indicators or block.starting_indicator is None else 1
+    )
+    end_index = None if block.include_indicators else -1
+    return [
+        re.sub(TEMPLATE_REGEX, evaluate, line)
+        for line in block.lines[start_index:end_index]
+    ]
+
+
+xd = CachedFlexdown(
     block_types=[DemoBlock, AlertBlock, DefinitionBlock, SectionBlock],
     component_map=component_map,
 )
 xd.clear_modules()
 
 
+@contextlib.contextmanager
+def worker_modules():
+    """Give a worker process its own directory for exec'd doc code.
+
+    Exec'd doc code is written to module files, so workers sharing the
+    default directory would append to each other's files. The directory is
+    cleared and the previous one restored when the context exits, so it is
+    also safe to use in the main process.
+    """
+    module_dir = xd.module_dir
+    xd.module_dir = f"modules_{os.getpid()}"
+    try:
+        yield
+    finally:
+        xd.clear_modules()
+        xd.module_dir = module_dir
+
+
+def _get_code_snippets(path: str) -> list[str]:
+    """Parse a file in a worker process and get the code of its demos.
+
+    Parsing stores the document in the on-disk cache for the page builds.
+
+    Args:
+        path: The path of the flexdown file.
+
+    Returns:
+        The code snippets of the demos in the file.
+    """
+    snippets = []
+    for block in xd.get_blocks(xd.parse_file(path).content, path):
+        if isinstance(block, DemoBlock):
+            snippets += block.get_code_snippets()
+    return snippets
+
+
+def _format_snippet(code: str) -> bool:
+    """Format a snippet in a worker process to warm the format cache.
+
+    Args:
+        code: The code to format.
+
+    Returns:
+        Whether the snippet could be formatted.
+    """
+    try:
+        format_python(code)
+    except Exception:
+        return False
+    return True
+
+
+def preformat_code(paths: list[str], jobs: int | None = None) -> tuple[int, int]:
+    """Parse the given files and format the code of every demo ahead of time.
+
+    The files are parsed and the snippets formatted in parallel, and both are
+    stored in the on-disk cache, so building the pages afterwards skips
+    parsing and black entirely. The pages themselves are still built serially.
+
+    Args:
+        paths: The flexdown files to scan.
+        jobs: The number of worker processes (defaults to the number of CPUs).
+
+    Returns:
+        The number of snippets found and the number that failed to format.
+    """
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        snippets = set()
+        for file_snippets in executor.map(_get_code_snippets, paths, chunksize=4):
+            snippets.update(file_snippets)
+        results = list(executor.map(_format_snippet, snippets, chunksize=16))
+    return len(snippets), results.count(False)
+
+
 def markdown(text):
     return xd.default_block_type().render_fn(content=text)
@@ -0,0 +1,128 @@
+"""Extract the documented attributes of classes from their source code.
+
+Each module is parsed once with `ast`, and every annotated assignment in
+every class body is paired with the comment block directly above it:
+
+    # The text to show.
+    text: Var[str]
+"""
+
+import ast
+import inspect
+import sys
+from typing import NamedTuple
+
+
+class Attribute(NamedTuple):
+    """An annotated attribute in a class body."""
+
+    # The name of the attribute.
+    name: str
+
+    # The source of the annotation.
+    annotation: str
+
+    # The comment above the attribute.
+    description: str
+
+
+# Mapping from source file to the attributes of each class in it, by qualname.
+_module_attributes: dict[str, dict[str, list[Attribute]]] = {}
+
+
+def get_comment(lines: list[str], lineno: int) -> str:
+    """Get the comment block directly above a line.
+
+    Args:
+        lines: The lines of the source file.
+        lineno: The 1-based number of the line.
+
+    Returns:
+        The comment lines joined without their "#" markers, or "" if there are none.
+    """
+    comments = []
+    i = lineno - 2
+    while i >= 0 and lines[i].strip().startswith("#"):
+        comments.append(lines[i])
+        i -= 1
+    return "".join(comment.strip().strip("#") for comment in reversed(comments))
+
+
+def parse_source(source: str) -> dict[str, list[Attribute]]:
+    """Get the annotated attributes of every class in a module's source.
+
+    Args:
+        source: The source code of the module.
+
+    Returns:
+        A mapping from class qualname to its attributes, in definition order.
+    """
+    lines = source.splitlines()
+    classes = {}
+
+    def visit(body: list[ast.stmt], prefix: str):
+        for node in body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            qualname = f"{prefix}{node.name}"
+            classes[qualname] = [
+                Attribute(
+                    name=stmt.target.id,
+                    annotation=ast.get_source_segment(source, stmt.annotation) or "",
+                    description=get_comment(lines, stmt.lineno),
+                )
+                for stmt in node.body
+                if isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name)
+            ]
+            visit(node.body, f"{qualname}.")
+
+    visit(ast.parse(source).body, "")
+    return classes
+
+
+def get_module_attributes(path: str) -> dict[str, list[Attribute]]:
+    """Get the annotated attributes of every class in a source file, parsing it once.
+
+    Args:
+        path: The path of the source file.
+
+    Returns:
+        A mapping from class qualname to its attributes.
+    """
+    if path not in _module_attributes:
+        with open(path, "r", encoding="utf-8") as f:
+            _module_attributes[path] = parse_source(f.read())
+    return _module_attributes[path]
+
+
+def get_source_file(cls: type) -> str | None:
+    """Get the source file a class is defined in.
+
+    Args:
+        cls: The class.
+
+    Returns:
+        The path of the file, or None if the class has no source.
+    """
+    module = sys.modules.get(cls.__module__)
+    if module is None:
+        return None
+    try:
+        return inspect.getsourcefile(module)
+    except TypeError:
+        return None
+
+
+def get_class_attributes(cls: type) -> list[Attribute]:
+    """Get the annotated attributes defined in the body of a class.
+
+    Args:
+        cls: The class.
+
+    Returns:
+        The attributes, or an empty list if the class's source isn't available.
+    """
+    path = get_source_file(cls)
+    if path is None:
+        return []
+    return get_module_attributes(path).get(cls.__qualname__, [])
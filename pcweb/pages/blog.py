@@ -13,7 +13,7 @@ PAGES_PATH = "blog/"
 def get_blog_data(paths):
     blogs = {}
     for path in reversed(sorted(paths)):
-        document = flexdown.parse_file(path)
+        document = xd.parse_file(path)
         path = path.replace(".md", "")
         blogs[path] = document
     return blogs
@@ -3,21 +3,24 @@ from collections import defaultdict
 from types import SimpleNamespace
 
 import flexdown
+import yaml
 
 import reflex as rx
 from pcweb.flexdown import xd
 from pcweb.pages.docs.component import multi_docs
 from pcweb.route import Route
 from pcweb.templates.docpage import docpage
+from reflex.base import Base
 from reflex.components.chakra.base import ChakraComponent
 from reflex.components.radix.primitives.base import RadixPrimitiveComponent
 from reflex.components.radix.themes.base import RadixThemesComponent
 
+from .apiref import versioned_routes
 from .gallery import gallery
 from .library import library
 from .resources import resources
 
-doc_routes = [gallery, library, resources]
+doc_routes = [gallery, library, resources, *versioned_routes]
 
 
 def to_title_case(text: str) -> str:
@@ -53,8 +56,71 @@ def build_nested_namespace(
     return parent_namespace
 
 
+class DocEntry(Base):
+    """A documentation page discovered in the docs tree."""
+
+    # The route of the page.
+    route: str
+
+    # The flexdown file the page is rendered from.
+    source: str
+
+    # The page title.
+    title: str
+
+    # The category of the page (the name of its parent directory).
+    category: str
+
+    # The front matter of the flexdown file.
+    metadata: dict = {}
+
+
+def read_front_matter(path: str) -> dict:
+    """Read only the front matter of a flexdown file.
+
+    The body of the file is never read, so this is cheap enough to run on
+    every file in the docs tree at import time.
+
+    Args:
+        path: The path of the flexdown file.
+
+    Returns:
+        The front matter of the file, or an empty dict if it has none.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if f.readline().strip() != "---":
+            return {}
+        lines = []
+        for line in f:
+            if line.strip() == "---":
+                break
+            lines.append(line)
+        else:
+            # The front matter was never closed, so there is none.
+            return {}
+    return yaml.safe_load("".join(lines)) or {}
+
+
+def render_doc(path: str) -> rx.Component:
+    """Render a flexdown file into a component.
+
+    Args:
+        path: The path of the flexdown file.
+
+    Returns:
+        The rendered component.
+    """
+    return xd.render(xd.parse_file(path), path)
+
+
 flexdown_docs = flexdown.utils.get_flexdown_files("docs/")
 
+# Mapping from route to the doc page it serves.
+doc_registry: dict[str, DocEntry] = {}
+
+# Mapping from component class to the route of its library page.
+component_routes: dict[type, str] = {}
+
 chakra_components = defaultdict(list)
 radix_components = defaultdict(list)
 component_list = defaultdict(list)
@@ -78,13 +144,13 @@ for doc in sorted(flexdown_docs):
     title = rx.utils.format.to_snake_case(os.path.basename(doc).replace(".md", ""))
     title2 = to_title_case(title)
     category = os.path.basename(os.path.dirname(doc)).title()
-    d = flexdown.parse_file(doc)
+    metadata = read_front_matter(doc)
     if doc.startswith("docs/library/chakra"):
-        clist = [title, *[eval(c) for c in d.metadata["components"]]]
+        clist = [title, *[eval(c) for c in metadata["components"]]]
         component_list[category].append(clist)
-        comp = multi_docs(path=route, comp=d, component_list=clist, title=title2)
+        comp = multi_docs(path=route, doc=doc, component_list=clist, title=title2)
     elif doc.startswith("docs/library"):
-        clist = [title, *[eval(c) for c in d.metadata["components"]]]
+        clist = [title, *[eval(c) for c in metadata["components"]]]
         if issubclass(
             clist[1],
             (RadixIconComponent, RadixThemesComponent, RadixPrimitiveComponent),
@@ -97,11 +163,23 @@ for doc in sorted(flexdown_docs):
             route = route.replace("library/", "library/chakra/")
         else:
             component_list[category].append(clist)
-        comp = multi_docs(path=route, comp=d, component_list=clist, title=title2)
+        comp = multi_docs(path=route, doc=doc, component_list=clist, title=title2)
     else:
-        comp = docpage(set_path=route, t=title2)(
-            lambda d=d, doc=doc: xd.render(d, doc)
-        )
+        comp = docpage(set_path=route, t=title2)(lambda doc=doc: render_doc(doc))
+
+    # Record the library page of each component it documents.
+    if doc.startswith("docs/library"):
+        for component in clist[1:]:
+            component_routes.setdefault(component, route)
+
+    # Record the page so it can be looked up without rendering it.
+    doc_registry[route] = DocEntry(
+        route=route,
+        source=doc,
+        title=title2,
+        category=category,
+        metadata=metadata,
+    )
 
     # Get the namespace.
     namespace = rx.utils.format.to_snake_case(doc.split("/")[1])
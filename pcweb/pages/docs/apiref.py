@@ -1,7 +1,14 @@
+import json
+import os
+from typing import Callable
+
 import reflex as rx
+from pcweb import cache
+from pcweb.constants import REFLEX_VERSION
+from pcweb.route import Route
 from pcweb.templates.docpage import docpage
 
-from .source import Source, generate_docs
+from .source import generate_docs, snapshot_class
 
 modules = [
     rx.App,
@@ -16,9 +23,125 @@ modules = [
     rx.Var,
 ]
 
+# The directory of the API reference snapshots, with a directory per reflex version
+# holding a JSON file per class.
+API_SNAPSHOT_DIR = os.getenv("API_SNAPSHOT_DIR", "api-snapshots")
+
+# Bump this when the snapshot format changes.
+API_SNAPSHOT_VERSION = 1
+
+
+def write_snapshot(snapshot_dir: str = API_SNAPSHOT_DIR) -> str:
+    """Snapshot the API reference of the installed reflex version.
+
+    Args:
+        snapshot_dir: The directory of the snapshots.
+
+    Returns:
+        The directory the snapshot was written to.
+    """
+    version_dir = os.path.join(snapshot_dir, REFLEX_VERSION)
+    for module in modules:
+        ref = {
+            "version": API_SNAPSHOT_VERSION,
+            "reflex_version": REFLEX_VERSION,
+            **snapshot_class(module),
+        }
+        path = os.path.join(version_dir, f"{module.__name__.lower()}.json")
+        cache.write_atomic(path, json.dumps(ref, indent=1))
+    return version_dir
+
+
+def load_snapshot(
+    version: str, name: str, snapshot_dir: str = API_SNAPSHOT_DIR
+) -> dict:
+    """Load the API reference of a class from a snapshot.
+
+    Args:
+        version: The reflex version of the snapshot.
+        name: The lowercase name of the class.
+        snapshot_dir: The directory of the snapshots.
+
+    Returns:
+        The reference of the class.
+
+    Raises:
+        ValueError: If the snapshot was written in another format.
+    """
+    path = os.path.join(snapshot_dir, version, f"{name}.json")
+    with open(path, "r", encoding="utf-8") as f:
+        ref = json.load(f)
+    if ref.get("version") != API_SNAPSHOT_VERSION:
+        raise ValueError(
+            f"{path} has snapshot format {ref.get('version')}, expected "
+            f"{API_SNAPSHOT_VERSION}; run scripts/api_snapshot.py with reflex "
+            f"{version} installed to rebuild it."
+        )
+    return ref
+
+
+def get_snapshot_names(snapshot_dir: str = API_SNAPSHOT_DIR) -> dict[str, list[str]]:
+    """Get the classes in each snapshot, without reading them.
+
+    Args:
+        snapshot_dir: The directory of the snapshots.
+
+    Returns:
+        A mapping from reflex version to the lowercase names of its classes.
+    """
+    if not os.path.isdir(snapshot_dir):
+        return {}
+    names = {}
+    for version in sorted(os.listdir(snapshot_dir)):
+        version_dir = os.path.join(snapshot_dir, version)
+        if os.path.isdir(version_dir):
+            names[version] = sorted(
+                filename.removesuffix(".json")
+                for filename in os.listdir(version_dir)
+                if filename.endswith(".json")
+            )
+    return names
+
+
+def ref_page(title: str, load: Callable[[], dict]) -> Callable[[], rx.Component]:
+    """Create a page that only loads its reference when it is built.
+
+    Args:
+        title: The title of the page.
+        load: A function that gets the reference of the class.
+
+    Returns:
+        The page function.
+    """
+
+    def docs() -> rx.Component:
+        return generate_docs(title, load())
+
+    return docs
+
+
+snapshot_names = get_snapshot_names()
+
 for module in modules:
-    s = Source(module=module)
     name = module.__name__.lower()
-    docs = generate_docs(name, s)
     title = name.replace("_", " ").title()
+    if name in snapshot_names.get(REFLEX_VERSION, []):
+        # Use the snapshot of the installed version instead of introspecting it.
+        docs = ref_page(title, lambda name=name: load_snapshot(REFLEX_VERSION, name))
+    else:
+        docs = ref_page(title, lambda module=module: snapshot_class(module))
     locals()[f"{name}_ref"] = docpage(f"/docs/api-reference/{name}", title)(docs)
+
+# The API reference of each snapshotted reflex version.
+versioned_routes: list[Route] = []
+for version, names in snapshot_names.items():
+    for name in names:
+        title = name.replace("_", " ").title()
+        docs = ref_page(
+            title, lambda version=version, name=name: load_snapshot(version, name)
+        )
+        versioned_routes.append(
+            docpage(f"/docs/api-reference/{version}/{name}", f"{title} ({version})")(
+                docs
+            )
+        )
@@ -1,11 +1,13 @@
 """Utility functions for the component docs page."""
 
 import inspect
+import json
 import os
-import re
 from typing import Any, Type, get_args
 
 import reflex as rx
+from pcweb import cache, introspect
+from pcweb.constants import REFLEX_VERSION
 from pcweb.flexdown import markdown, xd
 from pcweb.templates.docpage import docpage
 from reflex.base import Base
@@ -28,26 +30,79 @@ class Prop(Base):
 from reflex.components.el.elements.base import BaseHTML
 
 
+# Bump this when the way props are extracted changes.
+PROPS_CACHE_VERSION = 2
+
+# Mapping from component class to the props it defines itself.
+_class_props: dict[Type[Component], list[Prop]] = {}
+
+
+def get_cache_key(component: Type[Component]) -> str:
+    """Get the key of a component's entries in the on-disk cache.
+
+    Args:
+        component: The component class.
+
+    Returns:
+        A key that changes with the installed reflex version and the source
+        of the component or any of its base classes, since event triggers
+        are inherited.
+    """
+    # Catch edits to an editable install of reflex.
+    mtimes = []
+    for cls in component.__mro__:
+        path = introspect.get_source_file(cls)
+        if path is None:
+            continue
+        try:
+            mtimes.append((path, os.path.getmtime(path)))
+        except OSError:
+            continue
+    return cache.hash_key(REFLEX_VERSION, PROPS_CACHE_VERSION, sorted(set(mtimes)))
+
+
+def get_class_props(component: Type[Component]) -> list[Prop]:
+    """Get the props a component class defines itself.
+
+    Base classes are shared by many components, so the props of each class
+    are only extracted once. The names and
+    descriptions are also stored in the on-disk cache for the installed
+    reflex version.
+
+    Args:
+        component: The component class.
+
+    Returns:
+        The props defined in the class body.
+    """
+    if component in _class_props:
+        return _class_props[component]
+
+    name = f"{component.__module__}.{component.__qualname__}"
+    key = get_cache_key(component)
+    described = cache.load("component-props", name, key)
+    if described is None:
+        described = [
+            (prop.name, prop.description)
+            for prop in Source(component=component)._get_props()
+        ]
+        cache.store("component-props", name, key, described)
+
+    # Types aren't always picklable, so look them up again.
+    fields = component.get_fields()
+    _class_props[component] = [
+        Prop(name=prop, type_=fields[prop].outer_type_, description=description)
+        for prop, description in described
+    ]
+    return _class_props[component]
+
+
 class Source(Base):
     """Parse the source code of a component."""
 
     # The component to parse.
     component: Type[Component]
 
-    # The source code.
-    code: list[str] = []
-
-    def __init__(self, *args, **kwargs):
-        """Initialize the source code parser."""
-        super().__init__(*args, **kwargs)
-
-        # Get the source code.
-        self.code = [
-            line
-            for line in inspect.getsource(self.component).splitlines()
-            if len(line) > 0
-        ]
-
     def get_docs(self) -> str:
         """Get the docstring of the component.
 
@@ -62,7 +117,7 @@ class Source(Base):
         Returns:
             A dictionary of the props and their descriptions.
         """
-        props = self._get_props()
+        props = list(get_class_props(self.component))
 
         parent_cls = self.component.__bases__[0]
         if parent_cls != rx.Component and parent_cls != BaseHTML:
@@ -71,72 +126,22 @@ class Source(Base):
         return props
 
     def _get_props(self) -> list[Prop]:
-        """Get a dictionary of the props and their descriptions.
+        """Get the props defined in the body of the component class.
 
         Returns:
-            A dictionary of the props and their descriptions.
+            The props and their descriptions.
         """
-        # The output.
-        out = []
-
-        # Get the props for this component.
         props = self.component.get_props()
-
-        comments = []
-        # Loop through the source code.
-        for i, line in enumerate(self.code):
-            # Check if we've reached the functions.
-            reached_functions = re.search("def ", line)
-            if reached_functions:
-                # We've reached the functions, so stop.
-                break
-
-            # Get comments for prop
-            if line.strip().startswith("#"):
-                comments.append(line)
-                continue
-
-            # Check if this line has a prop.
-            match = re.search(r"\w+:", line)
-            if match is None:
-                # This line doesn't have a var, so continue.
-                continue
-
-            # Get the prop.
-            prop = match.group(0).strip(":")
-            if prop not in props:
-                # This isn't a prop, so continue.
-                continue
-
-            # redundant check just to double-check line above prop is a comment
-            comment_above = self.code[i - 1].strip()
-            assert comment_above.startswith(
-                "#"
-            ), f"Expected comment, got {comment_above}"
-
-            # Get the comment for this prop.
-            comment = Source.get_comment(comments)
-            # reset comments
-            comments.clear()
-
-            # Get the type of the prop.
-            type_ = self.component.get_fields()[prop].outer_type_
-
-            # Add the prop to the output.
-            out.append(
-                Prop(
-                    name=prop,
-                    type_=type_,
-                    description=comment,
-                )
+        fields = self.component.get_fields()
+        return [
+            Prop(
+                name=attribute.name,
+                type_=fields[attribute.name].outer_type_,
+                description=attribute.description,
             )
-
-        # Return the output.
-        return out
-
-    @staticmethod
-    def get_comment(comments: list[str]):
-        return "".join([comment.strip().strip("#") for comment in comments])
+            for attribute in introspect.get_class_attributes(self.component)
+            if attribute.name in props
+        ]
 
 
 # Mapping from types to colors.
@@ -154,8 +159,15 @@ TYPE_COLORS = {
 }
 
 
-def prop_docs(prop: Prop) -> list[rx.Component]:
-    """Generate the docs for a prop."""
+def describe_prop(prop: Prop) -> dict[str, str]:
+    """Describe a prop the way its docs show it.
+
+    Args:
+        prop: The prop.
+
+    Returns:
+        The name, type name and description of the prop.
+    """
     # Get the type of the prop.
     type_ = prop.type_
     if rx.utils.types._issubclass(prop.type_, rx.Var):
@@ -165,14 +177,13 @@ def prop_docs(prop: Prop) -> list[rx.Component]:
         type_ = type_.__name__
     except AttributeError:
         print(type_)
-
-    # Get the color of the prop.
-    color = TYPE_COLORS.get(type_, "gray")
+        type_ = str(type_)
 
     # if the type if leteral show all the options
+    description = prop.description
     if type_ == "Literal":
         output = get_args(prop.type_)
-        prop.description = (
+        description = (
             str(output)
             .replace("typing.Literal[", "")
             .replace("']", "")
@@ -180,19 +191,26 @@ def prop_docs(prop: Prop) -> list[rx.Component]:
             .replace(")", "")
             .replace(",", " | ")
         )
+    return {"name": prop.name, "type": type_, "description": description}
+
+
+def prop_docs(prop: dict[str, str]) -> list[rx.Component]:
+    """Generate the docs for a prop."""
+    # Get the color of the prop.
+    color = TYPE_COLORS.get(prop["type"], "gray")
 
     # Return the docs for the prop.
     return [
         rx.td(
-            rx.code(prop.name, color="#333"),
+            rx.code(prop["name"], color="#333"),
             padding_left="0",
         ),
         rx.td(
-            rx.badge(type_, color_scheme=color, variant="solid"),
+            rx.badge(prop["type"], color_scheme=color, variant="solid"),
             padding_left="0",
         ),
         rx.td(
-            markdown(prop.description),
+            markdown(prop["description"]),
             padding_left="0",
         ),
     ]
@@ -400,8 +418,8 @@ EVENTS = {
 }
 
 
-def generate_props(src):
-    if len(src.get_props()) == 0:
+def generate_props(props):
+    if len(props) == 0:
         return rx.vstack(
             rx.heading("Props", font_size="1em"),
             rx.text("No component specific props"),
@@ -420,7 +438,7 @@ def generate_props(src):
                     rx.th("Description/Values", padding_left="0"),
                 )
             ),
-            rx.tbody(*[rx.tr(*prop_docs(prop)) for prop in src.get_props()]),
+            rx.tbody(*[rx.tr(*prop_docs(prop)) for prop in props]),
             width="100%",
             padding_x="0",
             size="sm",
@@ -430,30 +448,59 @@ def generate_props(src):
     )
 
 
-# Default event triggers.
-default_triggers = rx.Component.create().get_event_triggers()
+# Mapping from component class to the signature of each of its event triggers.
+_trigger_signatures: dict[Type[Component], dict[str, tuple[str, ...]]] = {}
 
 
-import inspect
+def get_trigger_signatures(component: Type[Component]) -> dict[str, tuple[str, ...]]:
+    """Get the event triggers of a component class and the args they pass.
+
+    Getting the triggers means instantiating the component, so this is only
+    done once per class. The signatures are also stored in the on-disk cache
+    for the installed reflex version.
+
+    Args:
+        component: The component class.
+
+    Returns:
+        A mapping from trigger name to the names of its args.
+    """
+    if component in _trigger_signatures:
+        return _trigger_signatures[component]
 
+    name = f"{component.__module__}.{component.__qualname__}"
+    key = get_cache_key(component)
+    signatures = cache.load("component-triggers", name, key)
+    if signatures is None:
+        instance = rx.Component.create() if component is rx.Component else component()
+        signatures = {
+            str(trigger): tuple(inspect.getfullargspec(spec).args)
+            for trigger, spec in instance.get_event_triggers().items()
+        }
+        cache.store("component-triggers", name, key, signatures)
+    _trigger_signatures[component] = signatures
+    return signatures
 
-def same_trigger(t1, t2):
-    if t1 is None or t2 is None:
-        return False
-    args1 = inspect.getfullargspec(t1).args
-    args2 = inspect.getfullargspec(t2).args
-    return args1 == args2
 
+def get_custom_triggers(comp: Type[Component]) -> list[str]:
+    """Get the event triggers a component adds or changes.
 
-def generate_event_triggers(comp):
-    triggers = comp().get_event_triggers()
-    custom_events = [
+    Args:
+        comp: The component class.
+
+    Returns:
+        The names of the triggers, in the order the component defines them.
+    """
+    # The triggers every component has, with their default signatures.
+    default_triggers = set(get_trigger_signatures(rx.Component).items())
+    return [
         event
-        for event in triggers
-        if event != "on_drop"
-        and not same_trigger(triggers.get(event), default_triggers.get(event))
+        for event, signature in get_trigger_signatures(comp).items()
+        if event != "on_drop" and (event, signature) not in default_triggers
     ]
 
+
+def generate_event_triggers(custom_events):
     if not custom_events:
         return rx.vstack(
             rx.heading("Event Triggers", font_size="1em"),
@@ -490,11 +537,11 @@ def generate_event_triggers(comp):
     )
 
 
-def generate_valid_children(comp):
-    if not comp._valid_children:
+def generate_valid_children(children):
+    if not children:
         return rx.text("")
 
-    valid_children = [rx.wrap_item(rx.code(child)) for child in comp._valid_children]
+    valid_children = [rx.wrap_item(rx.code(child)) for child in children]
     return rx.vstack(
         rx.heading("Valid Children", font_size="1em"),
         rx.wrap(*valid_children),
@@ -504,17 +551,154 @@ def generate_valid_children(comp):
     )
 
 
+# The path of the component database, outside .web since reflex init replaces it.
+COMPONENT_DB_PATH = os.getenv("COMPONENT_DB_PATH", "component-db.json")
+
+# Bump this when the format of the component database changes.
+COMPONENT_DB_VERSION = 1
+
+# The components in the database, by import path, or None if it hasn't been loaded.
+_component_db: dict[str, dict] | None = None
+
+
+def get_component_key(component: Type[Component]) -> str:
+    """Get the key of a component in the database.
+
+    Args:
+        component: The component class.
+
+    Returns:
+        The import path of the component.
+    """
+    return f"{component.__module__}.{component.__qualname__}"
+
+
+def describe_component(component: Type[Component]) -> dict:
+    """Collect everything the docs show about a component.
+
+    This imports and instantiates the component, so it is only run live for
+    components missing from the database.
+
+    Args:
+        component: The component class.
+
+    Returns:
+        The name, docstring, props, custom event triggers and valid children.
+    """
+    return {
+        "name": component.__name__,
+        "docs": Source(component=component).get_docs() or "",
+        "props": [
+            describe_prop(prop) for prop in Source(component=component).get_props()
+        ],
+        "triggers": get_custom_triggers(component),
+        "valid_children": list(component._valid_children or []),
+    }
+
+
+def build_component_db(components: list[Type[Component]]) -> dict:
+    """Build the component database.
+
+    Args:
+        components: The documented components.
+
+    Returns:
+        The database, as JSON-serializable data.
+    """
+    return {
+        "version": COMPONENT_DB_VERSION,
+        "reflex_version": REFLEX_VERSION,
+        "components": {
+            get_component_key(component): describe_component(component)
+            for component in sorted(components, key=get_component_key)
+        },
+    }
+
+
+def write_component_db(
+    components: list[Type[Component]], path: str = COMPONENT_DB_PATH
+):
+    """Build the component database and write it to disk.
+
+    Args:
+        components: The documented components.
+        path: The path to write the database to.
+    """
+    data = json.dumps(build_component_db(components), indent=1, sort_keys=True)
+    cache.write_atomic(path, data)
+
+
+def load_component_db(path: str = COMPONENT_DB_PATH) -> dict[str, dict]:
+    """Load the component database.
+
+    Args:
+        path: The path of the database.
+
+    Returns:
+        The components, by import path, or an empty dict if the database is
+        missing or was built for another version.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            db = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        print(f"Ignoring corrupt component database {path}: {e}")
+        return {}
+    if (
+        db.get("version") != COMPONENT_DB_VERSION
+        or db.get("reflex_version") != REFLEX_VERSION
+    ):
+        print(
+            f"Ignoring component database {path} built for reflex "
+            f"{db.get('reflex_version')}; run scripts/component_db.py to rebuild it."
+        )
+        return {}
+    return db["components"]
+
+
+def lookup_component_info(component: Type[Component]) -> dict | None:
+    """Look up a component in the database, without introspecting it.
+
+    Args:
+        component: The component class.
+
+    Returns:
+        The entry from the database, or None if it's missing.
+    """
+    global _component_db
+    if _component_db is None:
+        _component_db = load_component_db()
+    return _component_db.get(get_component_key(component))
+
+
+def get_component_info(component: Type[Component]) -> dict:
+    """Get everything the docs show about a component.
+
+    Args:
+        component: The component class.
+
+    Returns:
+        The entry from the database, or one collected live if it's missing.
+    """
+    info = lookup_component_info(component)
+    if info is None:
+        info = describe_component(component)
+    return info
+
+
 def component_docs(component):
     """Generates documentation for a given component."""
-    src = Source(component=component)
-    props = generate_props(src)
-    triggers = generate_event_triggers(component)
-    children = generate_valid_children(component)
+    info = get_component_info(component)
+    props = generate_props(info["props"])
+    triggers = generate_event_triggers(info["triggers"])
+    children = generate_valid_children(info["valid_children"])
 
     return rx.box(
-        rx.heading(component.__name__, font_size="2em"),
+        rx.heading(info["name"], font_size="2em"),
         rx.divider(),
-        rx.box(markdown(src.get_docs()), padding_bottom="1em"),
+        rx.box(markdown(info["docs"]), padding_bottom="1em"),
         props,
         children,
         triggers,
@@ -541,9 +725,10 @@ tab_selected_style = {
 }
 
 
-def multi_docs(path, comp, component_list, title):
+def multi_docs(path, doc, component_list, title):
     @docpage(set_path=path, t=title)
     def out():
+        comp = xd.parse_file(doc)
         components = [component_docs(component) for component in component_list[1:]]
         fname = path.strip("/") + ".md"
         style_doc_exists = os.path.exists(fname.replace(".md", "-style.md"))
@@ -1,11 +1,8 @@
 import inspect
-import re
-
-# Get the comment for a specific field.
 from typing import Callable, Type
 
 import reflex as rx
-from pcweb import styles
+from pcweb import introspect, styles
 from pcweb.styles import font_weights as fw
 from pcweb.templates.docpage import h1_comp, h2_comp, text_comp
 
@@ -16,20 +13,6 @@ class Source(rx.Base):
     # The component to parse.
     module: Type
 
-    # The source code.
-    code: list[str] = []
-
-    def __init__(self, *args, **kwargs):
-        """Initialize the source code parser."""
-        super().__init__(*args, **kwargs)
-
-        # Get the source code.
-        self.code = [
-            line
-            for line in inspect.getsource(self.module).splitlines()
-            if len(line) > 0
-        ]
-
     def get_docs(self) -> str:
         """Get the docstring of the component.
 
@@ -38,10 +21,6 @@ class Source(rx.Base):
         """
         return self.module.__doc__
 
-    @staticmethod
-    def get_comment(comments: list[str]):
-        return "".join([comment.strip().strip("#") for comment in comments])
-
     def get_name(self) -> str:
         return ".".join((self.module.__module__, self.module.__qualname__))
 
@@ -72,69 +51,54 @@ class Source(rx.Base):
         ]
 
     def get_annotations(self, props) -> list[dict]:
-        """Get a dictionary of the props and their descriptions.
+        """Get the names and descriptions of the given attributes of the class.
+
+        Args:
+            props: The names of the attributes to include.
 
         Returns:
-            A dictionary of the props and their descriptions.
+            The attributes defined in the class body, in definition order.
         """
-        # The output.
-        out = []
-
-        comments = []
-        # Loop through the source code.
-        for i, line in enumerate(self.code):
-            # Check if we've reached the functions.
-            reached_functions = re.search("def ", line)
-            if reached_functions:
-                # We've reached the functions, so stop.
-                break
-
-            # Get comments for prop
-            if line.strip().startswith("#"):
-                comments.append(line)
-                continue
-
-            # Check if this line has a prop.
-            match = re.search("\\w+:", line)
-            if match is None:
-                # This line doesn't have a var, so continue.
-                continue
-
-            # Get the prop.
-            prop = match.group(0).strip(":")
-            if prop not in props:
-                # This isn't a prop, so continue.
-                comments.clear()
-                continue
-
-            # redundant check just to double-check line above prop is a comment
-            assert (
-                self.code[i - 1].strip().startswith("#")
-            ), f"Expected comment, got {comment}"
-
-            # Get the comment for this prop.
-            comment = Source.get_comment(comments)
-            # reset comments
-            comments.clear()
-
-            # Add the prop to the output.
-            out.append(
-                dict(
-                    name=prop,
-                    description=comment,
-                )
-            )
+        return [
+            dict(name=attribute.name, description=attribute.description)
+            for attribute in introspect.get_class_attributes(self.module)
+            if attribute.name in props
+        ]
+
+
+def snapshot_class(module: Type) -> dict:
+    """Get everything the API reference shows about a class.
 
-        # Return the output.
-        return out
+    Args:
+        module: The class.
+
+    Returns:
+        The name, overview, fields and methods of the class, as
+        JSON-serializable data.
+    """
+    s = Source(module=module)
+    return {
+        "name": s.get_name(),
+        "overview": s.get_overview() or "",
+        "class_fields": s.get_class_fields(),
+        "fields": s.get_fields(),
+        "methods": [
+            dict(
+                name=method["name"],
+                signature=method["signature"],
+                description=method["description"],
+            )
+            for method in s.get_methods()
+        ],
+    }
 
 
-def generate_docs(title: str, s: Source):
+def generate_docs(title: str, ref: dict):
     return rx.box(
         h1_comp(text=title.title()),
-        rx.code(s.get_name(), font_size=styles.H3_FONT_SIZE, font_weight=fw["section"]),
+        rx.code(ref["name"], font_size=styles.H3_FONT_SIZE, font_weight=fw["section"]),
         rx.divider(),
-        text_comp(text=s.get_overview()),
+        text_comp(text=ref["overview"]),
         h2_comp(text="Class Fields"),
         rx.box(
             rx.table(
@@ -152,7 +116,7 @@ def generate_docs(title: str, s: Source):
                             ),
                             rx.td(field["description"]),
                         )
-                        for field in s.get_class_fields()
+                        for field in ref["class_fields"]
                     ],
                 ),
             ),
@@ -175,7 +139,7 @@ def generate_docs(title: str, s: Source):
                             ),
                             rx.td(field["description"]),
                         )
-                        for field in s.get_fields()
+                        for field in ref["fields"]
                     ],
                 ),
             ),
@@ -202,7 +166,7 @@ def generate_docs(title: str, s: Source):
                             ),
                             rx.td(field["description"], white_space="normal"),
                         )
-                        for field in s.get_methods()
+                        for field in ref["methods"]
                     ],
                 ),
             ),
@@ -1,11 +1,6 @@
 import asyncio
-import json
-import os
-from datetime import datetime
 
-import httpx
 from email_validator import EmailNotValidError, validate_email
-from sqlmodel import Field
 
 import reflex as rx
 from pcweb import constants, styles
@@ -20,6 +15,7 @@ from pcweb.pages.docs import (
 )
 from pcweb.pages.docs.library import library
 from pcweb.templates import webpage
+from pcweb.waitlist import add_to_waitlist, check_deliverability, loops_queue
 
 link_style = {
     "color": "black",
@@ -39,11 +35,6 @@ class Confetti(rx.Component):
 confetti = Confetti.create
 
 
-class Waitlist(rx.Model, table=True):
-    email: str
-    date_created: datetime = Field(default_factory=datetime.utcnow, nullable=False)
-
-
 class IndexState(rx.State):
     """Hold the state for the home page."""
 
@@ -56,46 +47,36 @@ class IndexState(rx.State):
     # Whether to show the confetti.
     show_confetti: bool = False
 
-    def add_contact_to_loops(self, contact_data):
-        url = "https://app.loops.so/api/v1/contacts/create"
-        loops_api_key = os.getenv("LOOPS_API_KEY")
-        if loops_api_key is None:
-            print("Loops API key does not exist")
-        headers = {
-            "Accept": "application/json",
-            "Authorization": f"Bearer {loops_api_key}",
-        }
-
-        try:
-            with httpx.Client() as client:
-                response = client.post(url, headers=headers, json=contact_data)
-                response.raise_for_status()  # Raise an exception for HTTP errors (4xx and 5xx)
-
-        except httpx.RequestError as e:
-            print(f"An error occurred: {e}")
-
     def signup(self):
         """Sign the user up for the waitlist."""
-        # Check if the email is valid.
+        # Check if the email is valid, leaving the DNS lookups for later.
         try:
-            validation = validate_email(self.email, check_deliverability=True)
+            validation = validate_email(self.email, check_deliverability=False)
             self.email = validation.email
         except EmailNotValidError as e:
             # Alert the error message.
             return rx.window_alert(str(e))
 
-        # Check if the user is already on the waitlist.
-        with rx.session() as session:
-            user = session.query(Waitlist).filter(Waitlist.email == self.email).first()
-            if user is None:
-                # Add the user to the waitlist.
-                session.add(Waitlist(email=self.email))
-                session.commit()
-                contact_data = json.dumps({"email": self.email})
-                self.add_contact_to_loops(contact_data)
-
+        # Acknowledge the signup right away, and finish it in the background.
         self.signed_up = True
-        return IndexState.play_confetti
+        return [IndexState.play_confetti, IndexState.complete_signup]
+
+    @rx.background
+    async def complete_signup(self):
+        """Check that the email can receive mail, then add it to the waitlist."""
+        async with self:
+            email = self.email
+
+        try:
+            email = await check_deliverability(email)
+        except EmailNotValidError as e:
+            async with self:
+                self.signed_up = False
+            return rx.window_alert(str(e))
+
+        # Only new signups are added to Loops.
+        if await asyncio.to_thread(add_to_waitlist, email):
+            loops_queue.submit({"email": email})
 
     async def play_confetti(self):
         """Play confetti for 5sec then stop."""
@@ -5,8 +5,11 @@ import sys
 
 import reflex as rx
 import reflex.components.radix.themes as rdxt
-from pcweb import styles
+from pcweb import pages, styles
+from pcweb.components.sidebar import get_unregistered_links
 from pcweb.pages import page404, routes
+from pcweb.search import metrics
+from pcweb.search.autocomplete import build_autocomplete_index
 
 # This number discovered by trial and error on Windows 11 w/ Node 18, any
 # higher and the prod build fails with EMFILE error.
@@ -54,6 +57,9 @@ for route in routes:
         image="/previews/index_preview.png",
     )
 
+# Build the autocomplete index now that the docs have been loaded.
+build_autocomplete_index()
+
 # Add redirects
 redirects = [
     ("/docs", "/docs/getting-started/introduction"),
@@ -80,4 +86,16 @@ redirects = [
 for source, target in redirects:
     app.add_page(lambda: rx.fragment(), route=source, on_load=rx.redirect(target))
 
+# Warn about sidebar links that don't lead to any page.
+registered_paths = {route.path for route in pages.routes} | {
+    source for source, _ in redirects
+}
+for item in get_unregistered_links(registered_paths):
+    print(f"Warning: sidebar link {item.link!r} ({item.names}) has no page.")
+
 app.add_custom_404_page(page404.component)
+
+# Expose the search metrics on the backend, to holders of the metrics token only.
+if metrics.METRICS_TOKEN:
+    app.api.add_api_route("/metrics", metrics.metrics_prometheus)
+    app.api.add_api_route("/api/search/metrics", metrics.metrics_json)
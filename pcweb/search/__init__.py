@@ -0,0 +1,5 @@
+from .autocomplete import build_autocomplete_index, suggest
+from .cache import query_cache
+from .engine import LocalIndex, build_index, load_index, write_index
+from .metrics import search_metrics
+from .query import search_docs, search_local
@@ -0,0 +1,295 @@
+"""Typo-tolerant autocomplete for component names, API symbols, props and events.
+
+Names are stored in a trie whose nodes keep their best completions, so a
+prefix lookup only walks the prefix. Misspelled prefixes are matched by
+walking the trie with a Levenshtein row per node, pruning any branch that is
+already too far from the query.
+"""
+
+import time
+from typing import NamedTuple
+
+# The maximum number of suggestions to return, and to keep on each trie node.
+MAX_SUGGESTIONS = 8
+
+# How much each kind of name is favored, all else being equal.
+KIND_WEIGHTS = {"component": 3, "api": 2, "event": 1, "prop": 0}
+
+
+class Entry(NamedTuple):
+    """A name that can be suggested."""
+
+    # The name to show.
+    name: str
+
+    # The kind of name: component, api, event or prop.
+    kind: str
+
+    # The page that documents the name.
+    href: str
+
+    # The library, component or class the name belongs to, if any.
+    detail: str = ""
+
+
+def get_max_distance(query: str) -> int:
+    """Get how many typos to tolerate in a query.
+
+    Args:
+        query: The lowercase query.
+
+    Returns:
+        The maximum edit distance of a match.
+    """
+    if len(query) < 3:
+        return 0
+    if len(query) < 6:
+        return 1
+    return 2
+
+
+class _Node:
+    """A node in the trie."""
+
+    __slots__ = ("children", "entries", "top")
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        # The entries whose name ends at this node.
+        self.entries: list[int] = []
+        # The best entries whose name starts with this node's prefix.
+        self.top: list[int] = []
+
+
+class AutocompleteIndex:
+    """A ranked, typo-tolerant prefix index over names."""
+
+    def __init__(self, entries: list[Entry]):
+        """Build the index.
+
+        Names are deduplicated by name, kind and page, keeping the first entry,
+        so same-named components from different libraries are all kept.
+
+        Args:
+            entries: The names to suggest.
+        """
+        self.entries = []
+        seen = set()
+        for entry in entries:
+            key = (entry.name.lower(), entry.kind, entry.href)
+            if key not in seen:
+                seen.add(key)
+                self.entries.append(entry)
+
+        # The static rank of each entry: favored kinds first, then short names.
+        order = sorted(
+            range(len(self.entries)),
+            key=lambda entry_id: (
+                -KIND_WEIGHTS.get(self.entries[entry_id].kind, 0),
+                len(self.entries[entry_id].name),
+                self.entries[entry_id].name,
+            ),
+        )
+        self._ranks = [0] * len(self.entries)
+        for rank, entry_id in enumerate(order):
+            self._ranks[entry_id] = rank
+
+        self._root = _Node()
+        for entry_id, entry in enumerate(self.entries):
+            node = self._root
+            for char in entry.name.lower():
+                node = node.children.setdefault(char, _Node())
+            node.entries.append(entry_id)
+        self._collect_top(self._root)
+
+    def _collect_top(self, node: _Node) -> list[int]:
+        """Compute the best entries below each node.
+
+        Args:
+            node: The root of the subtree.
+
+        Returns:
+            The best entries in the subtree.
+        """
+        candidates = list(node.entries)
+        for child in node.children.values():
+            candidates.extend(self._collect_top(child))
+        candidates.sort(key=self._ranks.__getitem__)
+        node.top = candidates[:MAX_SUGGESTIONS]
+        return node.top
+
+    def _find(self, prefix: str) -> _Node | None:
+        """Find the node of a prefix.
+
+        Args:
+            prefix: The lowercase prefix.
+
+        Returns:
+            The node, or None if no name starts with the prefix.
+        """
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def _fuzzy_find(self, query: str, max_distance: int) -> dict[int, int]:
+        """Find the entries with a prefix within an edit distance of the query.
+
+        Args:
+            query: The lowercase query.
+            max_distance: The maximum edit distance.
+
+        Returns:
+            A mapping from entry to the smallest distance of its prefix.
+        """
+        distances = {}
+        first_row = list(range(len(query) + 1))
+        stack = [
+            (child, char, first_row) for char, child in self._root.children.items()
+        ]
+        while stack:
+            node, char, previous_row = stack.pop()
+            row = [previous_row[0] + 1]
+            for i in range(1, len(query) + 1):
+                cost = 0 if query[i - 1] == char else 1
+                row.append(
+                    min(row[i - 1] + 1, previous_row[i] + 1, previous_row[i - 1] + cost)
+                )
+
+            # This node's prefix matches the query, so its completions do too.
+            if row[-1] <= max_distance:
+                for entry_id in node.top:
+                    distances[entry_id] = min(distances.get(entry_id, row[-1]), row[-1])
+
+            # Only continue if a longer prefix could still match.
+            if min(row) <= max_distance:
+                stack.extend(
+                    (child, child_char, row)
+                    for child_char, child in node.children.items()
+                )
+        return distances
+
+    def suggest(self, query: str, k: int = MAX_SUGGESTIONS) -> list[Entry]:
+        """Suggest names for a partial query.
+
+        Exact prefix matches come first, then matches with typos.
+
+        Args:
+            query: The partial query.
+            k: The maximum number of suggestions.
+
+        Returns:
+            The suggestions, best first.
+        """
+        query = query.strip().lower()
+        if query == "":
+            return []
+
+        node = self._find(query)
+        suggestions = list(node.top[:k]) if node is not None else []
+        max_distance = get_max_distance(query)
+        if len(suggestions) < k and max_distance > 0:
+            distances = self._fuzzy_find(query, max_distance)
+            fuzzy = sorted(
+                (entry_id for entry_id in distances if entry_id not in suggestions),
+                key=lambda entry_id: (distances[entry_id], self._ranks[entry_id]),
+            )
+            suggestions.extend(fuzzy[: k - len(suggestions)])
+        return [self.entries[entry_id] for entry_id in suggestions]
+
+
+def get_library(route: str) -> str:
+    """Get the component library a library page belongs to.
+
+    Args:
+        route: The route of the library page.
+
+    Returns:
+        The library, such as chakra or radix, or "" if the page isn't in one.
+    """
+    parts = route.strip("/").split("/")
+    if len(parts) > 3 and parts[2] in ("chakra", "radix"):
+        return parts[2]
+    return ""
+
+
+def collect_entries() -> list[Entry]:
+    """Collect the names to suggest from the docs.
+
+    Returns:
+        The component, prop, event trigger and API names.
+    """
+    from pcweb.pages.docs import component_routes, doc_registry
+    from pcweb.pages.docs.apiref import modules
+    from pcweb.pages.docs.component import EVENTS, lookup_component_info
+
+    entries = []
+    for component, route in component_routes.items():
+        # Tell apart same-named components from different libraries.
+        entries.append(
+            Entry(component.__name__, "component", route, get_library(route))
+        )
+    for component, route in component_routes.items():
+        for prop in sorted(component.get_props()):
+            entries.append(Entry(prop, "prop", route, component.__name__))
+
+    # Link the triggers specific to a component to its page. They are only
+    # known from the component database, since finding them means
+    # instantiating the component.
+    for component, route in component_routes.items():
+        info = lookup_component_info(component)
+        if info is None:
+            continue
+        for event in info["triggers"]:
+            entries.append(Entry(event, "event", route, component.__name__))
+
+    event_route = "/docs/api-reference/event_triggers"
+    if event_route not in doc_registry:
+        event_route = "/docs/events/events_overview"
+    for event in EVENTS:
+        entries.append(Entry(event, "event", event_route))
+
+    for module in modules:
+        route = f"/docs/api-reference/{module.__name__.lower()}"
+        entries.append(Entry(f"rx.{module.__name__}", "api", route))
+        for name in sorted(vars(module)):
+            if not name.startswith("_"):
+                entries.append(Entry(name, "api", route, module.__name__))
+    return entries
+
+
+autocomplete_index: AutocompleteIndex | None = None
+
+
+def build_autocomplete_index() -> AutocompleteIndex:
+    """Build the autocomplete index from the docs.
+
+    Returns:
+        The index, which is also kept for `suggest`.
+    """
+    global autocomplete_index
+    start = time.perf_counter()
+    autocomplete_index = AutocompleteIndex(collect_entries())
+    elapsed = (time.perf_counter() - start) * 1000
+    print(
+        f"Built the autocomplete index of {len(autocomplete_index.entries)} names "
+        f"in {elapsed:.0f}ms."
+    )
+    return autocomplete_index
+
+
+def suggest(query: str, k: int = MAX_SUGGESTIONS) -> list[dict[str, str]]:
+    """Suggest names for a partial query.
+
+    Args:
+        query: The partial query.
+        k: The maximum number of suggestions.
+
+    Returns:
+        The suggestions, or an empty list if the index hasn't been built.
+    """
+    if autocomplete_index is None:
+        return []
+    return [entry._asdict() for entry in autocomplete_index.suggest(query, k)]
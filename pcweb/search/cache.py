@@ -0,0 +1,114 @@
+"""A process-wide cache of search results."""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+# How long a cached result stays fresh, in seconds.
+QUERY_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "300"))
+
+# The maximum number of queries to keep results for.
+QUERY_CACHE_MAX_SIZE = int(os.getenv("SEARCH_CACHE_MAX_SIZE", "1024"))
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so equivalent queries share a cache entry.
+
+    Args:
+        query: The search query.
+
+    Returns:
+        The lowercased query with whitespace collapsed.
+    """
+    return " ".join(query.lower().split())
+
+
+class QueryCache:
+    """An LRU cache of search results whose entries expire after a TTL."""
+
+    def __init__(self, max_size: int, ttl: float):
+        """Create a cache.
+
+        Args:
+            max_size: The maximum number of entries.
+            ttl: How long an entry stays fresh, in seconds.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_key(self, query: str, category: str, collection_name: str) -> tuple:
+        """Get the key of a query.
+
+        Args:
+            query: The search query.
+            category: The category searched in.
+            collection_name: The collection searched.
+
+        Returns:
+            The cache key.
+        """
+        return (normalize_query(query), category, collection_name)
+
+    def get(self, key: tuple) -> Any | None:
+        """Get the results for a key.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            The cached results, or None if they are missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: tuple, results: Any):
+        """Store the results for a key, evicting the least recently used entry if full.
+
+        Args:
+            key: The cache key.
+            results: The results to store.
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> dict[str, int]:
+        """Get the cache statistics.
+
+        Returns:
+            The number of entries, hits and misses.
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+query_cache = QueryCache(QUERY_CACHE_MAX_SIZE, QUERY_CACHE_TTL_SECONDS)
@@ -0,0 +1,424 @@
+"""A small embedded full-text search engine for the docs.
+
+It serves as a fallback when Typesense isn't configured or can't be reached.
+The index is built by `scripts/search_index.py --local-index` and stored in a
+single file that is memory-mapped, so only the parts a query touches are read:
+
+    header | documents | terms | strings | postings
+
+The header holds the counts, the average field lengths and the offset of each
+section. Documents and terms are fixed-size records pointing into the UTF-8
+strings section, and are decoded only when a query reaches them. Terms are
+sorted, so they are binary searched in place. The postings are fixed-size
+(doc, heading count, description count) records.
+"""
+
+import math
+import mmap
+import os
+import re
+import struct
+from collections import defaultdict
+
+from pcweb import cache
+
+# The path of the local index file, outside .web since reflex init replaces it.
+LOCAL_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", "search-index.bin")
+
+# Bump this when the file format changes.
+LOCAL_INDEX_VERSION = 2
+
+# The fields that are searched, and their weights (matching Typesense's 2:1).
+FIELDS = ("heading", "description")
+FIELD_WEIGHTS = (2.0, 1.0)
+
+# The maximum number of terms a query prefix is expanded to.
+MAX_PREFIX_EXPANSIONS = 32
+
+# How much a prefix match counts relative to an exact match.
+PREFIX_MATCH_WEIGHT = 0.5
+
+# BM25 parameters.
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_MAGIC = b"RXSI"
+# Magic, version, documents, terms, average field lengths and section offsets.
+_HEADER = struct.Struct("<4sIII2d4I")
+# The (offset, length) of the heading, description, href and category strings,
+# then the length of each field in terms.
+_DOC = struct.Struct("<8I2I")
+# The (offset, length) of the term string, then the start of its postings.
+_TERM = struct.Struct("<3I")
+_POSTING = struct.Struct("<IHH")
+# The string fields of a document, in record order.
+_DOC_FIELDS = ("heading", "description", "href", "category")
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase search terms.
+
+    Args:
+        text: The text to split.
+
+    Returns:
+        The terms in the text.
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def count_terms(docs: list[dict]) -> tuple[dict, list[list[int]]]:
+    """Count the occurrences of each term in each field of each document.
+
+    Args:
+        docs: The search documents.
+
+    Returns:
+        A mapping from term to a mapping from document to its count in each
+        field, and the length of each field of each document.
+    """
+    counts = defaultdict(dict)
+    lengths = []
+    for doc_id, doc in enumerate(docs):
+        doc_lengths = []
+        for field_num, field in enumerate(FIELDS):
+            tokens = tokenize(doc[field])
+            doc_lengths.append(len(tokens))
+            for token in tokens:
+                field_counts = counts[token].setdefault(doc_id, [0] * len(FIELDS))
+                field_counts[field_num] += 1
+        lengths.append(doc_lengths)
+    return counts, lengths
+
+
+def get_average_lengths(lengths: list[list[int]]) -> list[float]:
+    """Get the average length of each field.
+
+    Args:
+        lengths: The length of each field of each document.
+
+    Returns:
+        The average length of each field.
+    """
+    return [
+        max(sum(doc_lengths[i] for doc_lengths in lengths), 1) / max(len(lengths), 1)
+        for i in range(len(FIELDS))
+    ]
+
+
+def score_fields(
+    field_counts: list[int], doc_lengths: list[int], average_lengths: list[float]
+) -> float:
+    """Score how well a term matches a document, before weighting by rarity.
+
+    Args:
+        field_counts: The number of occurrences of the term in each field.
+        doc_lengths: The length of each field of the document.
+        average_lengths: The average length of each field.
+
+    Returns:
+        The weighted sum of the BM25 term frequency scores of the fields.
+    """
+    score = 0.0
+    for i, count in enumerate(field_counts):
+        if count == 0:
+            continue
+        norm = 1 - BM25_B + BM25_B * doc_lengths[i] / average_lengths[i]
+        score += FIELD_WEIGHTS[i] * count * (BM25_K1 + 1) / (count + BM25_K1 * norm)
+    return score
+
+
+def build_index(docs: list[dict]) -> bytes:
+    """Build a local index.
+
+    Args:
+        docs: The search documents, with heading, description, href and category.
+
+    Returns:
+        The serialized index.
+    """
+    counts, lengths = count_terms(docs)
+
+    # Store each distinct string once.
+    strings = bytearray()
+    string_offsets = {}
+
+    def add_string(value: str) -> tuple[int, int]:
+        if value not in string_offsets:
+            data = value.encode("utf-8")
+            string_offsets[value] = (len(strings), len(data))
+            strings.extend(data)
+        return string_offsets[value]
+
+    doc_records = bytearray()
+    for doc, doc_lengths in zip(docs, lengths):
+        refs = [part for field in _DOC_FIELDS for part in add_string(doc[field])]
+        doc_records += _DOC.pack(*refs, *doc_lengths)
+
+    # Pack the postings of each term, in term order.
+    terms = sorted(counts)
+    term_records = bytearray()
+    postings = bytearray()
+    for term in terms:
+        term_records += _TERM.pack(*add_string(term), len(postings) // _POSTING.size)
+        for doc_id, (heading_count, description_count) in sorted(counts[term].items()):
+            postings += _POSTING.pack(
+                doc_id, min(heading_count, 0xFFFF), min(description_count, 0xFFFF)
+            )
+    # A final record marks the end of the last term's postings.
+    term_records += _TERM.pack(0, 0, len(postings) // _POSTING.size)
+
+    docs_start = _HEADER.size
+    terms_start = docs_start + len(doc_records)
+    strings_start = terms_start + len(term_records)
+    postings_start = strings_start + len(strings)
+    header = _HEADER.pack(
+        _MAGIC,
+        LOCAL_INDEX_VERSION,
+        len(docs),
+        len(terms),
+        *get_average_lengths(lengths),
+        docs_start,
+        terms_start,
+        strings_start,
+        postings_start,
+    )
+    return header + doc_records + term_records + bytes(strings) + bytes(postings)
+
+
+def write_index(docs: list[dict], path: str = LOCAL_INDEX_PATH):
+    """Build a local index and write it to a file.
+
+    Args:
+        docs: The search documents.
+        path: The path to write the index to.
+    """
+    cache.write_atomic(path, build_index(docs))
+
+
+class LocalIndex:
+    """A local index, memory-mapped from a file."""
+
+    def __init__(self, path: str):
+        """Open an index.
+
+        Only the fixed-size header is read; everything else is read from the
+        memory map as queries need it.
+
+        Args:
+            path: The path of the index file.
+
+        Raises:
+            ValueError: If the file isn't a valid index.
+        """
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            version,
+            self.num_docs,
+            self.num_terms,
+            *self._average_lengths,
+            self._docs_start,
+            self._terms_start,
+            self._strings_start,
+            self._postings_start,
+        ) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a search index.")
+        if version != LOCAL_INDEX_VERSION:
+            raise ValueError(f"{path} has an unsupported version.")
+
+    def _get_string(self, offset: int, length: int) -> str:
+        """Decode a string from the strings section.
+
+        Args:
+            offset: The offset of the string in the section.
+            length: The length of the string in bytes.
+
+        Returns:
+            The string.
+        """
+        start = self._strings_start + offset
+        return self._mmap[start : start + length].decode("utf-8")
+
+    def get_doc(self, doc_id: int) -> dict:
+        """Decode a document.
+
+        Args:
+            doc_id: The number of the document.
+
+        Returns:
+            The heading, description, href and category of the document.
+        """
+        record = _DOC.unpack_from(self._mmap, self._docs_start + doc_id * _DOC.size)
+        return {
+            field: self._get_string(record[2 * i], record[2 * i + 1])
+            for i, field in enumerate(_DOC_FIELDS)
+        }
+
+    def _get_category(self, doc_id: int) -> str:
+        """Decode only the category of a document.
+
+        Args:
+            doc_id: The number of the document.
+
+        Returns:
+            The category.
+        """
+        record = _DOC.unpack_from(self._mmap, self._docs_start + doc_id * _DOC.size)
+        return self._get_string(record[6], record[7])
+
+    def _get_lengths(self, doc_id: int) -> tuple[int, int]:
+        """Get the length of each field of a document.
+
+        Args:
+            doc_id: The number of the document.
+
+        Returns:
+            The number of terms in the heading and the description.
+        """
+        record = _DOC.unpack_from(self._mmap, self._docs_start + doc_id * _DOC.size)
+        return record[8:]
+
+    def _get_term(self, term_num: int) -> tuple[str, int, int]:
+        """Decode a term of the term dictionary.
+
+        Args:
+            term_num: The position of the term in the term dictionary.
+
+        Returns:
+            The term and the first and last postings that belong to it.
+        """
+        offset = self._terms_start + term_num * _TERM.size
+        string_offset, length, start = _TERM.unpack_from(self._mmap, offset)
+        end = _TERM.unpack_from(self._mmap, offset + _TERM.size)[2]
+        return self._get_string(string_offset, length), start, end
+
+    def _get_postings(self, start: int, end: int) -> list[tuple[int, int, int]]:
+        """Get a range of postings.
+
+        Args:
+            start: The number of the first posting.
+            end: The number of the posting after the last one.
+
+        Returns:
+            The (doc, heading count, description count) postings.
+        """
+        start_offset = self._postings_start + start * _POSTING.size
+        end_offset = self._postings_start + end * _POSTING.size
+        return list(_POSTING.iter_unpack(self._mmap[start_offset:end_offset]))
+
+    def _expand(self, token: str) -> list[tuple[int, int, bool]]:
+        """Find the terms matching a query token.
+
+        Args:
+            token: The query token.
+
+        Returns:
+            The postings range of each matching term, and whether it is an
+            exact match.
+        """
+        # Binary search for the first term that isn't before the token.
+        low, high = 0, self.num_terms
+        while low < high:
+            middle = (low + high) // 2
+            if self._get_term(middle)[0] < token:
+                low = middle + 1
+            else:
+                high = middle
+
+        matches = []
+        for term_num in range(low, self.num_terms):
+            term, start, end = self._get_term(term_num)
+            if not term.startswith(token) or len(matches) >= MAX_PREFIX_EXPANSIONS:
+                break
+            matches.append((start, end, term == token))
+        return matches
+
+    def _score_token(self, token: str) -> dict[int, float]:
+        """Score the documents matching a query token.
+
+        Args:
+            token: The query token.
+
+        Returns:
+            A mapping from document to score.
+        """
+        scores = {}
+        for start, end, exact in self._expand(token):
+            postings = self._get_postings(start, end)
+            idf = math.log(
+                1 + (self.num_docs - len(postings) + 0.5) / (len(postings) + 0.5)
+            )
+            weight = idf * (1.0 if exact else PREFIX_MATCH_WEIGHT)
+            for doc_id, *field_counts in postings:
+                score = score_fields(
+                    field_counts, self._get_lengths(doc_id), self._average_lengths
+                )
+                # A token only counts once, through its best matching term.
+                scores[doc_id] = max(scores.get(doc_id, 0.0), weight * score)
+        return scores
+
+    def search(self, query: str, category: str = "All", limit: int = 10) -> list[dict]:
+        """Search the index.
+
+        Every query token must match, as a whole term or as a prefix.
+
+        Args:
+            query: The search query.
+            category: The category to search in, or "All".
+            limit: The maximum number of hits.
+
+        Returns:
+            The search hits, in the same shape as Typesense's.
+        """
+        scores = None
+        for token in tokenize(query):
+            token_scores = self._score_token(token)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {
+                    doc_id: score + token_scores[doc_id]
+                    for doc_id, score in scores.items()
+                    if doc_id in token_scores
+                }
+            if not scores:
+                return []
+        if scores is None:
+            return []
+
+        if category != "All":
+            scores = {
+                doc_id: score
+                for doc_id, score in scores.items()
+                if self._get_category(doc_id) == category
+            }
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [
+            {"document": self.get_doc(doc_id), "text_match": score}
+            for doc_id, score in ranked[:limit]
+        ]
+
+
+def load_index(path: str = LOCAL_INDEX_PATH) -> LocalIndex | None:
+    """Load the local index, if it has been built.
+
+    Args:
+        path: The path of the index file.
+
+    Returns:
+        The index, or None if it is missing or invalid.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        return LocalIndex(path)
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        print(f"Failed to load the search index {path}: {e}")
+        return None
+
+
+local_index = load_index()
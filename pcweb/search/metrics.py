@@ -0,0 +1,250 @@
+"""Latency and outcome metrics for doc search."""
+
+import hmac
+import os
+import threading
+from collections import Counter
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+
+from pcweb.search.cache import query_cache
+
+# The bearer token required to read the metrics. The endpoints aren't served
+# without one.
+METRICS_TOKEN = os.getenv("SEARCH_METRICS_TOKEN")
+
+# Whether the Prometheus metrics label zero-result searches with the query text.
+METRICS_INCLUDE_QUERIES = os.getenv("SEARCH_METRICS_INCLUDE_QUERIES", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# The upper bounds of the latency histogram buckets, in seconds.
+LATENCY_BUCKETS_SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0)
+
+# The maximum number of distinct zero-result queries to keep.
+MAX_ZERO_RESULT_QUERIES = 200
+
+
+class _Histogram:
+    """A cumulative latency histogram."""
+
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS_SECONDS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        """Record a latency.
+
+        Args:
+            seconds: The latency, in seconds.
+        """
+        for i, bound in enumerate(LATENCY_BUCKETS_SECONDS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+        self.count += 1
+        self.sum += seconds
+
+
+class SearchMetrics:
+    """Process-wide counters describing doc searches."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset all metrics."""
+        with self._lock:
+            # Latency, by the backend that answered (typesense, local or cache).
+            self.latency: dict[str, _Histogram] = {}
+            # Searches, by backend and outcome.
+            self.searches: Counter[tuple[str, str]] = Counter()
+            # Failed Typesense requests, by kind (timeout or http).
+            self.errors: Counter[str] = Counter()
+            # Searches, by category.
+            self.categories: Counter[str] = Counter()
+            # The queries that found nothing, and how often.
+            self.zero_result_queries: Counter[str] = Counter()
+
+    def record(
+        self,
+        query: str,
+        category: str,
+        source: str,
+        seconds: float,
+        num_hits: int,
+        error: str | None = None,
+    ):
+        """Record a search.
+
+        Args:
+            query: The normalized query.
+            category: The category searched in.
+            source: The backend that answered.
+            seconds: How long the search took.
+            num_hits: The number of hits.
+            error: The kind of Typesense error that was hit, if any.
+        """
+        with self._lock:
+            self.latency.setdefault(source, _Histogram()).observe(seconds)
+            self.searches[(source, "hit" if num_hits else "zero")] += 1
+            self.categories[category] += 1
+            if error is not None:
+                self.errors[error] += 1
+            if num_hits == 0:
+                self.zero_result_queries[query] += 1
+                # Drop the rarest query to bound memory.
+                if len(self.zero_result_queries) > MAX_ZERO_RESULT_QUERIES:
+                    rarest = min(
+                        self.zero_result_queries, key=self.zero_result_queries.get
+                    )
+                    del self.zero_result_queries[rarest]
+
+    def snapshot(self) -> dict:
+        """Get the current metrics.
+
+        Returns:
+            The metrics, as JSON-serializable data.
+        """
+        with self._lock:
+            return {
+                "latency": {
+                    source: {
+                        "buckets": dict(zip(LATENCY_BUCKETS_SECONDS, h.buckets)),
+                        "count": h.count,
+                        "sum": h.sum,
+                    }
+                    for source, h in self.latency.items()
+                },
+                "searches": [
+                    {"source": source, "result": result, "count": count}
+                    for (source, result), count in self.searches.items()
+                ],
+                "errors": dict(self.errors),
+                "categories": dict(self.categories),
+                "zero_result_queries": dict(self.zero_result_queries.most_common()),
+                "cache": query_cache.get_stats(),
+            }
+
+    def to_prometheus(self, include_queries: bool = False) -> str:
+        """Render the metrics in the Prometheus text format.
+
+        Args:
+            include_queries: Whether to label zero-result searches with the
+                query text, which is raw user input.
+
+        Returns:
+            The metrics text.
+        """
+        data = self.snapshot()
+        lines = [
+            "# HELP search_latency_seconds Time taken to answer a doc search.",
+            "# TYPE search_latency_seconds histogram",
+        ]
+        for source, h in data["latency"].items():
+            for bound, count in h["buckets"].items():
+                lines.append(
+                    f'search_latency_seconds_bucket{{source="{source}",le="{bound}"}} {count}'
+                )
+            lines.append(
+                f'search_latency_seconds_bucket{{source="{source}",le="+Inf"}} {h["count"]}'
+            )
+            lines.append(f'search_latency_seconds_sum{{source="{source}"}} {h["sum"]}')
+            lines.append(
+                f'search_latency_seconds_count{{source="{source}"}} {h["count"]}'
+            )
+
+        lines += [
+            "# HELP search_requests_total Doc searches, by backend and result.",
+            "# TYPE search_requests_total counter",
+        ]
+        for row in data["searches"]:
+            lines.append(
+                f'search_requests_total{{source="{row["source"]}",result="{row["result"]}"}} {row["count"]}'
+            )
+
+        lines += [
+            "# HELP search_errors_total Failed Typesense requests, by kind.",
+            "# TYPE search_errors_total counter",
+        ]
+        for kind, count in data["errors"].items():
+            lines.append(f'search_errors_total{{kind="{kind}"}} {count}')
+
+        lines += [
+            "# HELP search_category_total Doc searches, by category.",
+            "# TYPE search_category_total counter",
+        ]
+        for category, count in data["categories"].items():
+            lines.append(
+                f'search_category_total{{category="{_escape(category)}"}} {count}'
+            )
+
+        if include_queries:
+            lines += [
+                "# HELP search_zero_result_total Searches that found nothing, by query.",
+                "# TYPE search_zero_result_total counter",
+            ]
+            for query, count in data["zero_result_queries"].items():
+                lines.append(
+                    f'search_zero_result_total{{query="{_escape(query)}"}} {count}'
+                )
+
+        lines += [
+            "# HELP search_cache_total Query cache lookups, by result.",
+            "# TYPE search_cache_total counter",
+            f'search_cache_total{{result="hit"}} {data["cache"]["hits"]}',
+            f'search_cache_total{{result="miss"}} {data["cache"]["misses"]}',
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value.
+
+    Args:
+        value: The label value.
+
+    Returns:
+        The escaped value.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+search_metrics = SearchMetrics()
+
+
+def is_authorized(request: Request) -> bool:
+    """Check that a request carries the metrics token.
+
+    Args:
+        request: The request.
+
+    Returns:
+        Whether the request may read the metrics.
+    """
+    if METRICS_TOKEN is None:
+        return False
+    expected = f"Bearer {METRICS_TOKEN}"
+    provided = request.headers.get("Authorization", "")
+    return hmac.compare_digest(provided.encode("utf-8"), expected.encode("utf-8"))
+
+
+async def metrics_json(request: Request) -> Response:
+    """Serve the search metrics as JSON."""
+    if not is_authorized(request):
+        return Response(status_code=401)
+    return JSONResponse(search_metrics.snapshot())
+
+
+async def metrics_prometheus(request: Request) -> Response:
+    """Serve the search metrics in the Prometheus text format."""
+    if not is_authorized(request):
+        return Response(status_code=401)
+    return PlainTextResponse(
+        search_metrics.to_prometheus(include_queries=METRICS_INCLUDE_QUERIES),
+        media_type="text/plain; version=0.0.4",
+    )
@@ -0,0 +1,188 @@
+"""Query the docs search index."""
+
+import os
+import time
+
+import httpx
+
+from pcweb import tsclient
+from pcweb.search import engine
+from pcweb.search.cache import normalize_query, query_cache
+from pcweb.search.metrics import search_metrics
+
+# The Typesense collection (or alias) to search.
+COLLECTION_NAME = os.getenv("TYPESENSE_COLLECTION_NAME", "search-auto")
+
+# The maximum number of results to show.
+RESULTS_PER_PAGE = 8
+
+# The fields of a result that are shown.
+RESULT_FIELDS = ("heading", "description", "href", "category")
+
+# The approximate length of the description snippet of a result.
+SNIPPET_LENGTH = 160
+
+# The tags Typesense marks matches in highlights with.
+HIGHLIGHT_TAGS = ("<mark>", "</mark>")
+
+
+def get_search_parameters(query: str, category: str = "All") -> dict:
+    """Get the Typesense search parameters for a query.
+
+    Args:
+        query: The search query.
+        category: The category to search in, or "All".
+
+    Returns:
+        The search parameters.
+    """
+    search_parameters = {
+        "q": query,
+        "query_by": "heading, description",
+        "query_by_weights": "2,1",
+        "sort_by": "_text_match:desc",
+        "per_page": RESULTS_PER_PAGE,
+        "include_fields": ",".join(RESULT_FIELDS),
+        "highlight_fields": "description",
+        "highlight_affix_num_tokens": 12,
+        "highlight_start_tag": HIGHLIGHT_TAGS[0],
+        "highlight_end_tag": HIGHLIGHT_TAGS[1],
+    }
+    if category != "All":
+        search_parameters["filter_by"] = f"category: {category}"
+    return search_parameters
+
+
+def make_snippet(text: str, query: str, length: int = SNIPPET_LENGTH) -> str:
+    """Cut a snippet around the first match of a query out of a text.
+
+    Args:
+        text: The text to cut the snippet from.
+        query: The normalized search query.
+        length: The approximate length of the snippet.
+
+    Returns:
+        The snippet, with ellipses where the text was cut.
+    """
+    if len(text) <= length:
+        return text
+
+    # Center the snippet on the first query token found in the text.
+    lower = text.lower()
+    positions = [lower.find(token) for token in query.split()]
+    position = min((p for p in positions if p >= 0), default=0)
+    start = max(position - length // 4, 0)
+    end = min(start + length, len(text))
+
+    # Don't cut words in half.
+    if start > 0:
+        start = text.find(" ", start) + 1 or start
+    if end < len(text):
+        end = text.rfind(" ", start, end) if " " in text[start:end] else end
+    snippet = text[start:end].strip()
+    return f"{'...' if start > 0 else ''}{snippet}{'...' if end < len(text) else ''}"
+
+
+def shape_hit(hit: dict, query: str) -> dict:
+    """Trim a search hit down to what the results list shows.
+
+    Args:
+        hit: The search hit.
+        query: The normalized search query.
+
+    Returns:
+        The hit, with only the shown fields and a description snippet.
+    """
+    document = hit["document"]
+    snippet = next(
+        (
+            highlight["snippet"]
+            for highlight in hit.get("highlights", [])
+            if highlight.get("field") == "description" and "snippet" in highlight
+        ),
+        None,
+    )
+    if snippet is None:
+        snippet = make_snippet(document.get("description", ""), query)
+    else:
+        for tag in HIGHLIGHT_TAGS:
+            snippet = snippet.replace(tag, "")
+    return {
+        "document": {
+            **{field: document.get(field, "") for field in RESULT_FIELDS},
+            "description": snippet,
+        }
+    }
+
+
+def search_local(query: str, category: str = "All") -> list[dict]:
+    """Search the docs with the local index.
+
+    Args:
+        query: The search query.
+        category: The category to search in, or "All".
+
+    Returns:
+        The search hits, or an empty list if there is no local index.
+    """
+    if engine.local_index is None:
+        return []
+    return [
+        shape_hit(hit, query)
+        for hit in engine.local_index.search(query, category, RESULTS_PER_PAGE)
+    ]
+
+
+async def _search(query: str, category: str) -> tuple[list[dict], str, str | None]:
+    """Search the docs with the best available backend.
+
+    Args:
+        query: The normalized search query.
+        category: The category to search in, or "All".
+
+    Returns:
+        The shaped search hits, the backend that answered, and the kind of Typesense
+        error that was hit, if any.
+    """
+    if tsclient.async_client is None:
+        return search_local(query, category), "local", None
+
+    # Serve repeated queries from the cache.
+    key = query_cache.get_key(query, category, COLLECTION_NAME)
+    hits = query_cache.get(key)
+    if hits is not None:
+        return hits, "cache", None
+
+    try:
+        response = await tsclient.async_client.search(
+            COLLECTION_NAME, get_search_parameters(query, category)
+        )
+    except httpx.HTTPError as e:
+        print(f"Search for {query!r} failed, using the local index: {e}")
+        error = "timeout" if isinstance(e, httpx.TimeoutException) else "http"
+        return search_local(query, category), "local", error
+    hits = [shape_hit(hit, query) for hit in response["hits"]]
+    query_cache.set(key, hits)
+    return hits, "typesense", None
+
+
+async def search_docs(query: str, category: str = "All") -> list[dict]:
+    """Search the docs, recording the latency and outcome of the search.
+
+    Args:
+        query: The search query.
+        category: The category to search in, or "All".
+
+    Returns:
+        The search hits.
+    """
+    query = normalize_query(query)
+    if query == "":
+        return []
+
+    start = time.perf_counter()
+    hits, source, error = await _search(query, category)
+    search_metrics.record(
+        query, category, source, time.perf_counter() - start, len(hits), error
+    )
+    return hits
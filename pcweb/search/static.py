@@ -0,0 +1,112 @@
+"""Build the search index that is shipped to the browser."""
+
+import gzip
+import json
+import os
+
+from pcweb import cache
+from pcweb.search import engine
+
+# The path of the static index in the assets, and the URL it is served from.
+STATIC_INDEX_PATH = os.path.join("assets", "search-index.json.gz")
+STATIC_INDEX_URL = "/search-index.json.gz"
+
+# Bump this when the format changes.
+STATIC_INDEX_VERSION = 1
+
+# The environment variable that switches search to the browser. It must be set
+# when the app is compiled, and the static index must have been built.
+STATIC_SEARCH_ENV_VAR = "REFLEX_WEB_STATIC_SEARCH"
+
+# Only the start of each description is shown in the results.
+DESCRIPTION_PREVIEW_LENGTH = 200
+
+# Scores are stored as integers, scaled by this factor.
+SCORE_SCALE = 100
+
+
+def build_static_index(docs: list[dict]) -> bytes:
+    """Build the static index.
+
+    Scoring uses the same BM25 field weighting as the local index, with the
+    per-document part of the score precomputed so the browser only has to
+    combine it with each term's rarity.
+
+    Args:
+        docs: The search documents.
+
+    Returns:
+        The gzipped JSON index.
+    """
+    counts, lengths = engine.count_terms(docs)
+    average_lengths = engine.get_average_lengths(lengths)
+
+    terms = sorted(counts)
+    postings = []
+    for term in terms:
+        # Flatten the postings to [doc, score, doc, score, ...].
+        term_postings = []
+        for doc_id, field_counts in sorted(counts[term].items()):
+            score = engine.score_fields(field_counts, lengths[doc_id], average_lengths)
+            term_postings += [doc_id, max(round(score * SCORE_SCALE), 1)]
+        postings.append(term_postings)
+
+    index = {
+        "version": STATIC_INDEX_VERSION,
+        "docs": [
+            [
+                doc["heading"],
+                doc["description"][:DESCRIPTION_PREVIEW_LENGTH],
+                doc["href"],
+                doc["category"],
+            ]
+            for doc in docs
+        ],
+        "terms": terms,
+        "postings": postings,
+    }
+    data = json.dumps(index, separators=(",", ":")).encode("utf-8")
+
+    # Fix the timestamp so unchanged docs produce an identical asset.
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def write_static_index(docs: list[dict], path: str = STATIC_INDEX_PATH):
+    """Build the static index and write it to the assets.
+
+    Args:
+        docs: The search documents.
+        path: The path to write the index to.
+    """
+    cache.write_atomic(path, build_static_index(docs))
+
+
+def has_static_index(path: str = STATIC_INDEX_PATH) -> bool:
+    """Check whether the static index has been built.
+
+    Args:
+        path: The path of the index.
+
+    Returns:
+        Whether the index exists.
+    """
+    return os.path.exists(path)
+
+
+def use_static_search() -> bool:
+    """Check whether search should run in the browser.
+
+    Returns:
+        Whether static search is enabled.
+
+    Raises:
+        RuntimeError: If static search is enabled but the index hasn't been built.
+    """
+    if os.getenv(STATIC_SEARCH_ENV_VAR, "").lower() not in ("1", "true", "yes"):
+        return False
+    if not has_static_index():
+        raise RuntimeError(
+            f"{STATIC_SEARCH_ENV_VAR} is set but {STATIC_INDEX_PATH} doesn't exist; "
+            "build it with scripts/search_index.py --static-index."
+        )
+    return True
@@ -1,12 +1,13 @@
 """Template for documentation pages."""
 
+import functools
 import textwrap
 from typing import Any, Callable
 
 import black
 
 import reflex as rx
-from pcweb import styles
+from pcweb import cache, styles
 from pcweb.components.logo import navbar_logo
 from pcweb.route import Route, get_path
 from pcweb.styles import colors as c
@@ -210,12 +211,9 @@ def docpage(set_path: str | None = None, t: str | None = None) -> rx.Component:
             from pcweb.components.sidebar import get_prev_next
             from pcweb.components.sidebar import sidebar as sb
 
-            # Create the docpage sidebar.
+            # Create the docpage sidebar, shared with the navbar sidebar.
             sidebar = sb(url=path)
 
-            # Set the sidebar path for the navbar sidebar.
-            nav_sidebar = sb(url=path)
-
             # Get the previous and next sidebar links.
             prev, next = get_prev_next(path)
             links = []
@@ -261,7 +259,7 @@ def docpage(set_path: str | None = None, t: str | None = None) -> rx.Component:
 
             # Return the templated page.
             return rx.box(
-                navbar(sidebar=nav_sidebar),
+                navbar(sidebar=sidebar),
                 rx.box(
                     rx.flex(
                         rx.desktop_only(
@@ -501,6 +499,35 @@ def doccmdoutput(
     )
 
 
+# The line length to format Python snippets with.
+CODE_LINE_LENGTH = 60
+
+
+@functools.lru_cache(maxsize=4096)
+def format_python(code: str, line_length: int = CODE_LINE_LENGTH) -> str:
+    """Format a Python snippet with black.
+
+    Results are memoized in memory and stored on disk, keyed by the dedented
+    source, the line length and the black version.
+
+    Args:
+        code: The code to format.
+        line_length: The maximum line length.
+
+    Returns:
+        The formatted code.
+    """
+    code = textwrap.dedent(code)
+    key = cache.hash_key(code, line_length, black.__version__)
+    formatted = cache.load("black", key, key)
+    if formatted is None:
+        formatted = black.format_str(
+            code, mode=black.FileMode(line_length=line_length)
+        ).strip()
+        cache.store("black", key, key, formatted)
+    return formatted
+
+
 def doccode(
     code: str,
     language: str = "python",
@@ -520,9 +547,7 @@ def doccode(
     """
     # For Python snippets, lint the code with black.
     if language == "python":
-        code = black.format_str(
-            textwrap.dedent(code), mode=black.FileMode(line_length=60)
-        ).strip()
+        code = format_python(code)
 
     # If needed, only display a subset of the lines.
     if lines is not None:
@@ -1,21 +1,83 @@
 # pcweb/tsclient.py
 import os
 
+import httpx
 import typesense
 
+TYPESENSE_API_KEY = os.getenv("TYPESENSE_API_KEY")
+TYPESENSE_HOST = os.getenv("TYPESENSE_HOST", "6xtoqsb1a4ip9u8gp-1.a1.typesense.net")
+TYPESENSE_PORT = os.getenv("TYPESENSE_PORT", "443")
+TYPESENSE_PROTOCOL = os.getenv("TYPESENSE_PROTOCOL", "https")
+TYPESENSE_TIMEOUT_SECONDS = 2
+
 try:
     client = typesense.Client(
         {
-            "api_key": os.getenv("TYPESENSE_API_KEY"),
+            "api_key": TYPESENSE_API_KEY,
             "nodes": [
                 {
-                    "host": "6xtoqsb1a4ip9u8gp-1.a1.typesense.net",
-                    "port": "443",
-                    "protocol": "https",
+                    "host": TYPESENSE_HOST,
+                    "port": TYPESENSE_PORT,
+                    "protocol": TYPESENSE_PROTOCOL,
                 }
             ],
-            "connection_timeout_seconds": 2,
+            "connection_timeout_seconds": TYPESENSE_TIMEOUT_SECONDS,
         }
     )
 except:
     client = None
+
+
+class AsyncSearchClient:
+    """An async Typesense client for searching, sharing one connection pool."""
+
+    def __init__(self, api_key: str, base_url: str, timeout: float):
+        """Initialize the client.
+
+        Args:
+            api_key: The Typesense API key.
+            base_url: The URL of the Typesense node.
+            timeout: The request timeout in seconds.
+        """
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self._client = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Create the pool lazily, so it's bound to the event loop that uses it.
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"X-TYPESENSE-API-KEY": self.api_key},
+                timeout=self.timeout,
+                limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+            )
+        return self._client
+
+    async def search(self, collection_name: str, search_parameters: dict) -> dict:
+        """Search the documents of a collection.
+
+        Args:
+            collection_name: The collection (or alias) to search.
+            search_parameters: The Typesense search parameters.
+
+        Returns:
+            The search response.
+        """
+        response = await self._get_client().get(
+            f"/collections/{collection_name}/documents/search",
+            params=search_parameters,
+        )
+        response.raise_for_status()
+        return response.json()
+
+
+if TYPESENSE_API_KEY:
+    async_client = AsyncSearchClient(
+        TYPESENSE_API_KEY,
+        f"{TYPESENSE_PROTOCOL}://{TYPESENSE_HOST}:{TYPESENSE_PORT}",
+        TYPESENSE_TIMEOUT_SECONDS,
+    )
+else:
+    async_client = None
@@ -0,0 +1,177 @@
+"""Add people to the hosting waitlist in the background."""
+
+import asyncio
+import os
+from datetime import datetime
+
+import httpx
+from email_validator import caching_resolver, validate_email
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Field
+
+import reflex as rx
+
+# The Loops endpoint that creates a contact.
+LOOPS_API_URL = "https://app.loops.so/api/v1/contacts/create"
+
+# The Loops API key.
+LOOPS_API_KEY = os.getenv("LOOPS_API_KEY")
+
+# The request timeout for Loops, in seconds.
+LOOPS_TIMEOUT_SECONDS = 10
+
+# How many times to try creating a contact.
+LOOPS_MAX_ATTEMPTS = 3
+
+# How long to wait before retrying a failed request, doubled after each attempt.
+LOOPS_BACKOFF_SECONDS = 1.0
+
+# The maximum number of contacts to create at once.
+LOOPS_BATCH_SIZE = 10
+
+# How long to wait for more contacts to create along with the first, in seconds.
+LOOPS_BATCH_WAIT_SECONDS = 1.0
+
+# The timeout for the DNS lookups of the deliverability check, in seconds.
+DNS_TIMEOUT_SECONDS = 5
+
+# Shared by all deliverability checks, so a domain's records are only looked up
+# again once their DNS TTL expires.
+dns_resolver = caching_resolver(timeout=DNS_TIMEOUT_SECONDS)
+
+
+class Waitlist(rx.Model, table=True):
+    email: str = Field(unique=True, index=True)
+    date_created: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
+async def check_deliverability(email: str) -> str:
+    """Check that an email address can receive mail.
+
+    The DNS lookups run in a thread, so they don't block the event loop.
+
+    Args:
+        email: The email address.
+
+    Returns:
+        The normalized email address.
+
+    Raises:
+        EmailNotValidError: If the address can't receive mail.
+    """
+    validation = await asyncio.to_thread(
+        validate_email, email, check_deliverability=True, dns_resolver=dns_resolver
+    )
+    return validation.email
+
+
+def add_to_waitlist(email: str) -> bool:
+    """Add an email address to the waitlist, if it isn't on it already.
+
+    Args:
+        email: The normalized email address.
+
+    Returns:
+        Whether the address was added.
+    """
+    with rx.session() as session:
+        if session.query(Waitlist).filter(Waitlist.email == email).first():
+            return False
+        session.add(Waitlist(email=email))
+        try:
+            session.commit()
+        except IntegrityError:
+            # A concurrent signup added the address since the check.
+            session.rollback()
+            return False
+    return True
+
+
+class LoopsQueue:
+    """Creates Loops contacts from a background worker.
+
+    Contacts are collected into batches that are sent concurrently over one
+    connection pool.
+    """
+
+    def __init__(self, api_key: str | None):
+        """Initialize the queue.
+
+        Args:
+            api_key: The Loops API key, or None to skip creating contacts.
+        """
+        self.api_key = api_key
+        self._queue: asyncio.Queue[dict] | None = None
+        self._worker: asyncio.Task | None = None
+        self._client: httpx.AsyncClient | None = None
+
+    def submit(self, contact: dict):
+        """Queue a contact to be created.
+
+        Args:
+            contact: The contact data, such as {"email": ...}.
+        """
+        if self.api_key is None:
+            print("Loops API key does not exist")
+            return
+        # Start the worker on the event loop of the first submission.
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        self._queue.put_nowait(contact)
+
+    async def _run(self):
+        """Create queued contacts in batches, forever."""
+        self._client = httpx.AsyncClient(
+            headers={
+                "Accept": "application/json",
+                "Authorization": f"Bearer {self.api_key}",
+            },
+            timeout=LOOPS_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=LOOPS_BATCH_SIZE),
+        )
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + LOOPS_BATCH_WAIT_SECONDS
+            while len(batch) < LOOPS_BATCH_SIZE:
+                try:
+                    batch.append(
+                        await asyncio.wait_for(
+                            self._queue.get(), max(deadline - loop.time(), 0)
+                        )
+                    )
+                except asyncio.TimeoutError:
+                    break
+            await asyncio.gather(*(self._create(contact) for contact in batch))
+
+    async def _create(self, contact: dict) -> bool:
+        """Create a contact, retrying failures and rate limits.
+
+        Args:
+            contact: The contact data.
+
+        Returns:
+            Whether the contact exists in Loops.
+        """
+        for attempt in range(LOOPS_MAX_ATTEMPTS):
+            delay = LOOPS_BACKOFF_SECONDS * 2**attempt
+            try:
+                response = await self._client.post(LOOPS_API_URL, json=contact)
+            except httpx.HTTPError as e:
+                print(f"An error occurred: {e}")
+            else:
+                # A conflict means the contact was already created.
+                if response.is_success or response.status_code == 409:
+                    return True
+                if response.status_code == 429:
+                    delay = float(response.headers.get("Retry-After", delay))
+                elif response.status_code < 500:
+                    print(f"Loops rejected contact: {response.status_code}")
+                    return False
+            await asyncio.sleep(delay)
+        print(f"Failed to create Loops contact {contact.get('email')}")
+        return False
+
+
+loops_queue = LoopsQueue(LOOPS_API_KEY)
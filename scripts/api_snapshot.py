@@ -0,0 +1,16 @@
+"""Script to snapshot the API reference of the installed reflex version."""
+import argparse
+
+from pcweb.pages.docs.apiref import API_SNAPSHOT_DIR, write_snapshot
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--output",
+        default=API_SNAPSHOT_DIR,
+        help="Directory of the snapshots, with a directory per reflex version.",
+    )
+    args = parser.parse_args()
+
+    version_dir = write_snapshot(args.output)
+    print(f"Wrote the API reference snapshot to {version_dir}.")
@@ -0,0 +1,23 @@
+"""Script to build the component reference database."""
+import argparse
+import time
+
+from pcweb.pages.docs import component_routes
+from pcweb.pages.docs.component import COMPONENT_DB_PATH, write_component_db
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--output",
+        default=COMPONENT_DB_PATH,
+        help="Path to write the component database to.",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    write_component_db(list(component_routes), args.output)
+    elapsed = time.perf_counter() - start
+    print(
+        f"Wrote {len(component_routes)} components to {args.output} "
+        f"in {elapsed:.1f}s."
+    )
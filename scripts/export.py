@@ -0,0 +1,46 @@
+"""Script to export the site, warming the build caches first."""
+import argparse
+import os
+import subprocess
+import sys
+
+from pcweb.search.static import STATIC_SEARCH_ENV_VAR
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of processes to warm the caches with.",
+    )
+    parser.add_argument(
+        "--static-search",
+        action="store_true",
+        default=False,
+        help="Build a search index into the assets so search runs in the browser.",
+    )
+    args, reflex_args = parser.parse_known_args()
+    jobs = str(args.jobs)
+    env = {**os.environ, STATIC_SEARCH_ENV_VAR: "1" if args.static_search else "0"}
+
+    # Build the component reference first, so pages don't introspect components.
+    result = subprocess.run([sys.executable, "scripts/component_db.py"])
+    if result.returncode != 0:
+        sys.exit(result.returncode)
+
+    # Warm the document and code format caches that reflex export reads from.
+    result = subprocess.run(
+        [sys.executable, "scripts/preformat_code.py", "--jobs", jobs]
+    )
+    if result.returncode != 0:
+        sys.exit(result.returncode)
+
+    # Build the local search index, and the static one if it is served.
+    index_command = [sys.executable, "scripts/search_index.py", "--local-index"]
+    if args.static_search:
+        index_command.append("--static-index")
+    result = subprocess.run([*index_command, "--jobs", jobs])
+    if result.returncode != 0:
+        sys.exit(result.returncode)
+    sys.exit(subprocess.run(["reflex", "export", *reflex_args], env=env).returncode)
@@ -0,0 +1,17 @@
+"""Script to warm the document and code format caches for all docs."""
+import argparse
+
+import flexdown
+
+from pcweb.flexdown import preformat_code
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--path", default="docs/")
+    parser.add_argument("--jobs", type=int, default=None)
+    args = parser.parse_args()
+
+    paths = sorted(flexdown.utils.get_flexdown_files(args.path))
+    print(f"Formatting code snippets in {len(paths)} files.")
+    total, failed = preformat_code(paths, jobs=args.jobs)
+    print(f"{total} snippets formatted, {failed} failed.")
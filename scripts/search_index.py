@@ -1,19 +1,28 @@
 """Script to index docs to Typesense."""
 import argparse
+import hashlib
 import json
 import os
+import re
+import sys
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 import mistletoe
 import reflex as rx
+import requests
 from reflex.components.base.bare import Bare
+from typesense.exceptions import ObjectNotFound, TypesenseClientError
 
 from pcweb.pages import routes
+from pcweb.pages.docs import component_routes
+from pcweb.pages.docs.apiref import versioned_routes
+from pcweb.pages.docs.component import EVENTS, get_custom_triggers
+from pcweb.search.engine import LOCAL_INDEX_PATH, write_index
+from pcweb.search.static import STATIC_INDEX_PATH, write_static_index
 from pcweb.tsclient import client
-from pcweb.flexdown import xd
-
-from flexdown import Document
-from flexdown.blocks import MarkdownBlock
+from pcweb.flexdown import worker_modules, xd
 
 
 def index_flexdown(source: str, href: str) -> list[tuple[str, str, str]]:
@@ -26,31 +35,9 @@ def index_flexdown(source: str, href: str) -> list[tuple[str, str, str]]:
     Returns:
         A list of tuples of the form (type, text, href).
     """
-    source = Document.from_source(source)
-
-    # The environment used for execing and evaling code.
-    env = source.metadata
-    env["__xd"] = xd
-
-    # Get the content of the document.
-    source = source.content
-
-    # Get the blocks in the source code.
+    # Extract the markdown without rendering the demos.
     # Note: we must use reflex-web's special flexdown instance xd here - it knows about all custom block types (like DemoBlock)
-    blocks = xd.get_blocks(source, href)
-
-    content_pieces = []
-    for block in blocks:
-        # Render all blocks for their side effect of env augmentation
-        # Unexpected, but hey!
-        # TODO Probably better to return env as part of return
-        _ = block.render(env=env)
-        if isinstance(block, MarkdownBlock):
-            # Now we should have all the env entries we need
-            content = block.get_content(env)
-            content_pieces.append(content)
-
-    content = "\n".join(content_pieces)
+    content = xd.get_text(source, href)
 
     def get_strings(comp):
         """Get the strings from markdown component."""
@@ -147,6 +134,78 @@ def postprocess(
     }
 
 
+# The maximum length of an indexed passage, in characters.
+MAX_PASSAGE_LENGTH = 1000
+
+# Where text can be split between sentences.
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+
+def get_heading_id(heading: str) -> str:
+    """Get the id that h_comp_common gives a heading on the page.
+
+    Args:
+        heading: The text of the heading.
+
+    Returns:
+        The id of the heading element.
+    """
+    return "-".join(heading.lower().split(" "))
+
+
+def split_passages(text: str, max_length: int = MAX_PASSAGE_LENGTH) -> list[str]:
+    """Split text into passages of bounded length.
+
+    Passages are split between sentences where possible, then between words.
+
+    Args:
+        text: The text to split.
+        max_length: The maximum length of a passage.
+
+    Returns:
+        The passages, in order.
+    """
+    # Break the text into pieces that each fit in a passage.
+    pieces = []
+    for sentence in SENTENCE_BOUNDARY.split(text.strip()):
+        if len(sentence) <= max_length:
+            pieces.append(sentence)
+            continue
+        for word in sentence.split():
+            pieces += [
+                word[i : i + max_length] for i in range(0, len(word), max_length)
+            ]
+
+    # Pack as many pieces as fit into each passage.
+    passages = [""]
+    for piece in pieces:
+        if passages[-1] and len(passages[-1]) + 1 + len(piece) > max_length:
+            passages.append("")
+        passages[-1] = f"{passages[-1]} {piece}" if passages[-1] else piece
+    return passages
+
+
+def chunk_sections(
+    sections: dict[tuple[str, str], str], anchors: bool = True
+) -> dict[tuple[str, str, int], str]:
+    """Split the sections of pages into passages that link to their heading.
+
+    Args:
+        sections: A dictionary of the form {(heading, href): text}
+        anchors: Whether the page's headings have ids to link to.
+
+    Returns:
+        A dictionary of the form {(heading, href, part): passage}
+    """
+    passages = {}
+    for (heading, href), text in sections.items():
+        if anchors:
+            href = f"{href}#{get_heading_id(heading)}"
+        for part, passage in enumerate(split_passages(text)):
+            passages[(heading, href, part)] = passage
+    return passages
+
+
 class Doc(rx.Base):
     heading: str
     description: str
@@ -199,16 +258,92 @@ def index_flexdown_file(
     return postprocess(texts, join_char="")
 
 
-def index_routes():
-    """Index the routes."""
+def index_route(route) -> dict[tuple[str, str, int], str]:
+    """Index a single route.
+
+    Args:
+        route: The route to index.
+
+    Returns:
+        A dictionary of the form {(heading, href, part): passage}
+    """
+    flexdown_path = f"{route.path.strip('/')}.md"
+    if os.path.exists(flexdown_path):
+        return chunk_sections(index_flexdown_file(flexdown_path))
+
+    # Headings of pages that aren't written in flexdown have no ids.
+    comp = route.component()
+    return chunk_sections(postprocess(index_component(comp, route.path)), anchors=False)
+
+
+def index_triggers() -> dict[tuple[str, str, int], str]:
+    """Index the custom event triggers of the documented components.
+
+    The triggers are read from the cached trigger table, so components are only
+    instantiated if the cache is cold.
+
+    Returns:
+        A dictionary of the form {(heading, href, part): passage}
+    """
+    sections = {}
+    for component, route in component_routes.items():
+        triggers = get_custom_triggers(component)
+        if not triggers:
+            continue
+        heading = f"{component.__name__} Event Triggers"
+        sections[(heading, route)] = " ".join(
+            f"{trigger}: {EVENTS.get(trigger, {}).get('description', '')}"
+            for trigger in triggers
+        )
+    return chunk_sections(sections, anchors=False)
+
+
+def index_shard(paths: list[str]) -> dict[str, tuple[dict, float]]:
+    """Index a shard of routes in a worker process.
+
+    Args:
+        paths: The paths of the routes to index.
+
+    Returns:
+        A mapping from route path to its index and the seconds it took.
+    """
+    routes_by_path = {route.path: route for route in routes}
     out = {}
-    for route in routes:
-        flexdown_path = f"{route.path.strip('/')}.md"
-        if os.path.exists(flexdown_path):
-            out |= index_flexdown_file(flexdown_path)
-        else:
-            comp = route.component()
-            out |= postprocess(index_component(comp, route.path))
+    with worker_modules():
+        for path in paths:
+            start = time.perf_counter()
+            index = index_route(routes_by_path[path])
+            out[path] = index, time.perf_counter() - start
+    return out
+
+
+def index_routes(jobs: int = 1):
+    """Index the routes.
+
+    Args:
+        jobs: The number of processes to index the routes with.
+
+    Returns:
+        A dictionary of the form {(heading, href, part): passage}
+    """
+    # Only index the API reference of the current version, not of every snapshot.
+    versioned_paths = {route.path for route in versioned_routes}
+    paths = [route.path for route in routes if route.path not in versioned_paths]
+    if jobs > 1:
+        shards = [paths[i::jobs] for i in range(jobs)]
+        results = {}
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for shard_results in executor.map(index_shard, shards):
+                results |= shard_results
+    else:
+        results = index_shard(paths)
+
+    # Merge in route order, so the output doesn't depend on the number of jobs.
+    out = {}
+    for path in paths:
+        index, seconds = results[path]
+        print(f"{seconds:6.2f}s {path}")
+        out |= index
     return out
 
 
@@ -223,13 +358,17 @@ def determine_category(path):
         return "Learn"
 
 
-def index_everything():
-    """Index everything."""
-    everything = index_routes()
+def index_everything(jobs: int = 1):
+    """Index everything.
+
+    Args:
+        jobs: The number of processes to index the routes with.
+    """
+    everything = index_routes(jobs) | index_triggers()
     everything_with_categories = {}
     for key, text in everything.items():
         category = determine_category(key[1])
-        new_key = (key[0], key[1], category)
+        new_key = (*key, category)
         everything_with_categories[new_key] = text
     return everything_with_categories
 
@@ -254,38 +393,318 @@ def create_collection(collection_name: str):
     )
 
 
-def upload_docs(collection_name: str, docs: list[Doc]):
-    """Upload the docs."""
-    for doc in docs:
-        print("Uploading")
-        print(doc)
-        client.collections[collection_name].documents.create(doc)
+def import_batch(
+    collection_name: str,
+    docs: list[dict],
+    action: str = "create",
+    max_retries: int = 3,
+    backoff_seconds: float = 1.0,
+) -> list[dict]:
+    """Import a batch of docs, retrying the rows that fail.
+
+    Args:
+        collection_name: The collection to import into.
+        docs: The docs to import.
+        action: The import action ("create" or "upsert").
+        max_retries: How many times to retry failed rows.
+        backoff_seconds: The delay before the first retry, doubled every retry.
+
+    Returns:
+        The rows that still failed, as dicts with the document and the error.
+    """
+    pending = [{"document": doc, "error": None} for doc in docs]
+    for attempt in range(max_retries + 1):
+        if attempt > 0:
+            time.sleep(backoff_seconds * 2 ** (attempt - 1))
+
+        jsonl = "\n".join(json.dumps(row["document"]) for row in pending)
+        try:
+            response = client.collections[collection_name].documents.import_(
+                jsonl, {"action": action}
+            )
+        except (TypesenseClientError, requests.exceptions.RequestException) as e:
+            # The whole request failed (or never reached Typesense), so retry
+            # every row.
+            for row in pending:
+                row["error"] = str(e)
+            continue
+
+        # The response has one JSON result per line, in the order of the docs.
+        results = [json.loads(line) for line in response.splitlines() if line]
+        failed = []
+        for row, result in zip(pending, results):
+            if not result.get("success"):
+                row["error"] = result.get("error")
+                failed.append(row)
+        pending = failed
+        if not pending:
+            break
+    return pending
+
+
+def upload_docs(
+    collection_name: str, docs: list[dict], batch_size: int = 100, **kwargs
+) -> list[dict]:
+    """Upload the docs in batches using JSONL imports.
+
+    Args:
+        collection_name: The collection to upload to.
+        docs: The docs to upload.
+        batch_size: The number of docs to send per request.
+        **kwargs: Import options passed to `import_batch`.
+
+    Returns:
+        The rows that failed to upload, as dicts with the document and the error.
+    """
+    failed = []
+    for start in range(0, len(docs), batch_size):
+        batch = docs[start : start + batch_size]
+        failed += import_batch(collection_name, batch, **kwargs)
+        print(f"Uploaded {min(start + batch_size, len(docs))}/{len(docs)} documents.")
+    return failed
+
+
+def get_doc_id(heading: str, href: str, part: int = 0) -> str:
+    """Get a stable id for a passage of the section with a heading on a page.
+
+    Args:
+        heading: The heading of the section.
+        href: The href of the section.
+        part: The position of the passage in the section.
+
+    Returns:
+        The id of the document for the passage.
+    """
+    return hashlib.sha1(f"{heading}\0{href}\0{part}".encode("utf-8")).hexdigest()
+
+
+def get_fingerprint(doc: dict) -> str:
+    """Get a fingerprint of the contents of a doc.
+
+    Args:
+        doc: The doc to fingerprint.
+
+    Returns:
+        A hash that changes whenever any field of the doc changes.
+    """
+    return hashlib.sha256(json.dumps(doc, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def load_manifest(path: str) -> dict | None:
+    """Load the manifest of the last upload.
+
+    Args:
+        path: The path of the manifest.
+
+    Returns:
+        The manifest, or None if there isn't one.
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_manifest(path: str, collection_name: str, fingerprints: dict[str, str]):
+    """Save the manifest of an upload.
+
+    Args:
+        path: The path of the manifest.
+        collection_name: The collection the docs were uploaded to.
+        fingerprints: Mapping from doc id to the fingerprint of the uploaded doc.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"collection": collection_name, "documents": fingerprints}, f)
+
+
+def get_alias_target(alias: str) -> str | None:
+    """Get the collection an alias points to.
+
+    Args:
+        alias: The name of the alias.
+
+    Returns:
+        The name of the collection, or None if the alias doesn't exist.
+    """
+    try:
+        return client.aliases[alias].retrieve()["collection_name"]
+    except ObjectNotFound:
+        return None
+
+
+def rebuild_collection(
+    alias: str, docs: list[dict], **kwargs
+) -> tuple[str, dict[str, str], list[dict]]:
+    """Upload all docs to a new collection and point the alias at it.
+
+    Searches keep hitting the old collection until the new one is complete,
+    so a rebuild never serves partial results.
+
+    Args:
+        alias: The alias searches are made against.
+        docs: The docs to upload.
+        **kwargs: Options passed to `upload_docs`.
+
+    Returns:
+        The new collection, the fingerprints of the uploaded docs and the rows
+        that failed. If any rows failed, the new collection is deleted and the
+        alias is left unchanged.
+    """
+    collection_name = f"{alias}-{int(time.time())}"
+    print(f"Creating Typesense collection {collection_name}.")
+    create_collection(collection_name)
+    published = False
+    try:
+        failed = upload_docs(collection_name, docs, **kwargs)
+        if failed:
+            # Keep serving the old collection.
+            return collection_name, {}, failed
+
+        old_collection_name = get_alias_target(alias)
+        print(f"Pointing alias {alias} to {collection_name}.")
+        if old_collection_name is None:
+            # Searches used to go to a plain collection with the alias's name,
+            # which has to be deleted before the alias can take that name.
+            # Nothing runs between the delete and the upsert, to keep the
+            # window without an index as short as possible.
+            try:
+                client.collections[alias].delete()
+            except ObjectNotFound:
+                pass
+            # The new collection is now the only complete index, so keep it
+            # even if pointing the alias at it fails.
+            published = True
+        client.aliases.upsert(alias, {"collection_name": collection_name})
+        published = True
+    finally:
+        if not published:
+            # Drop the incomplete collection, even if the upload crashed.
+            client.collections[collection_name].delete()
+    if old_collection_name is not None:
+        client.collections[old_collection_name].delete()
+
+    fingerprints = {doc["id"]: get_fingerprint(doc) for doc in docs}
+    return collection_name, fingerprints, failed
+
+
+def update_collection(
+    collection_name: str, docs: list[dict], previous: dict[str, str], **kwargs
+) -> tuple[dict[str, str], list[dict]]:
+    """Upload only the docs that changed since the last upload.
+
+    Args:
+        collection_name: The collection to update.
+        docs: All the docs that should be in the collection.
+        previous: The fingerprints of the last upload, by doc id.
+        **kwargs: Options passed to `upload_docs`.
+
+    Returns:
+        The fingerprints of the docs now in the collection and the rows that
+        failed to upload.
+    """
+    fingerprints = {doc["id"]: get_fingerprint(doc) for doc in docs}
+    changed = [
+        doc for doc in docs if previous.get(doc["id"]) != fingerprints[doc["id"]]
+    ]
+    removed = [doc_id for doc_id in previous if doc_id not in fingerprints]
+    print(f"{len(changed)} documents changed, {len(removed)} removed.")
+
+    failed = upload_docs(collection_name, changed, action="upsert", **kwargs)
+    for row in failed:
+        # Record the old version so the doc is retried on the next run.
+        doc_id = row["document"]["id"]
+        if doc_id in previous:
+            fingerprints[doc_id] = previous[doc_id]
+        else:
+            del fingerprints[doc_id]
+
+    for doc_id in removed:
+        try:
+            client.collections[collection_name].documents[doc_id].delete()
+        except ObjectNotFound:
+            pass
+    return fingerprints, failed
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--upload", action="store_true", default=False)
     parser.add_argument("--collection-name")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        default=False,
+        help="Only upload the documents that changed since the last upload.",
+    )
+    parser.add_argument("--manifest", help="Path of the manifest of the last upload.")
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument(
+        "--local-index",
+        nargs="?",
+        const=LOCAL_INDEX_PATH,
+        help="Also write the documents to a local search index at this path.",
+    )
+    parser.add_argument(
+        "--static-index",
+        nargs="?",
+        const=STATIC_INDEX_PATH,
+        help="Also write the documents to a static search index for the browser.",
+    )
     args = parser.parse_args()
 
     if bool(args.upload) != bool(args.collection_name):
         raise ValueError("Must set both or neither of --upload and --collection-name.")
 
     print("Generating index documents.")
-    out = index_everything()
+    out = index_everything(jobs=args.jobs)
     docs = []
     for key, text in out.items():
         docs.append(
-            {"heading": key[0], "description": text, "href": key[1], "category": key[2]}
+            {
+                "id": get_doc_id(key[0], key[1], key[2]),
+                "heading": key[0],
+                "description": text,
+                "href": key[1],
+                "category": key[3],
+            }
         )
     print(f"{len(docs)} documents done.")
+    if args.local_index:
+        write_index(docs, args.local_index)
+        print(f"Wrote the local search index to {args.local_index}.")
+    if args.static_index:
+        write_static_index(docs, args.static_index)
+        print(f"Wrote the static search index to {args.static_index}.")
     if args.upload:
-        print(f"Recreating Typesense collection {args.collection_name}.")
-        create_collection(args.collection_name)
-        print("Uploading documents to Typesense.")
-        upload_docs(args.collection_name, docs)
+        # Kept outside .web, which reflex init replaces.
+        manifest_path = args.manifest or f"search-manifest-{args.collection_name}.json"
+        manifest = load_manifest(manifest_path)
+        target = get_alias_target(args.collection_name)
+        options = dict(batch_size=args.batch_size, max_retries=args.max_retries)
+        if args.incremental and manifest and manifest["collection"] == target:
+            print(f"Updating Typesense collection {target}.")
+            fingerprints, failed = update_collection(
+                target, docs, manifest["documents"], **options
+            )
+        else:
+            print(f"Rebuilding Typesense collection {args.collection_name}.")
+            target, fingerprints, failed = rebuild_collection(
+                args.collection_name, docs, **options
+            )
+        if fingerprints:
+            save_manifest(manifest_path, target, fingerprints)
+        if failed:
+            print(f"\033[91m{len(failed)} documents failed to upload:")
+            for row in failed:
+                doc = row["document"]
+                print(f"  {doc['href']} ({doc['heading']}): {row['error']}")
+            sys.exit(1)
         print("\033[92mUpload complete!")
-    else:
+    elif not (args.local_index or args.static_index):
         print(json.dumps(docs, indent=4))
         print(
             "\033[96m[set --upload and --collection-name to actually publish to Typesense Cloud]"